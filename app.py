@@ -5,6 +5,7 @@ Run locally:   streamlit run app.py
 Deploy:        push to GitHub → connect on share.streamlit.io
 """
 
+import hashlib
 import tempfile
 from datetime import datetime
 from pathlib import Path
@@ -373,10 +374,15 @@ for k, v in {
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
-@st.cache_data(ttl=60, show_spinner="Loading records…")
-def _load_records(eng, act, sev, search, d_from, d_to):
-    from db_logger import fetch_filtered_rows
-    return fetch_filtered_rows(
+def _version(*tables) -> tuple:
+    """Data version of the given tables; cached loaders take it as an argument
+    so a write to one table only invalidates the caches that read it."""
+    from db_logger import data_version
+    return data_version(*tables)
+
+
+def _record_filters(eng, act, sev, search, d_from, d_to) -> dict:
+    return dict(
         engineer      = "" if eng == "All engineers"  else eng,
         activity_type = "" if act == "All types"      else act,
         severity      = "" if sev == "All severities" else sev,
@@ -386,6 +392,102 @@ def _load_records(eng, act, sev, search, d_from, d_to):
     )
 
 
+@st.cache_data(ttl=600, show_spinner="Loading records…")
+def _load_records(eng, act, sev, search, d_from, d_to,
+                  page_size, cursor, direction, version):
+    from db_logger import fetch_filtered_page
+    return fetch_filtered_page(
+        **_record_filters(eng, act, sev, search, d_from, d_to),
+        page_size = page_size,
+        cursor    = cursor,
+        direction = direction,
+    )
+
+
+@st.cache_resource(show_spinner="Applying database migrations…")
+def _run_migrations() -> list[int]:
+    from db_logger import run_migrations
+    return run_migrations()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _load_entry(row_id, logged_at, version):
+    from db_logger import fetch_entry
+    return fetch_entry(row_id, logged_at)
+
+
+@st.cache_resource(show_spinner=False)
+def _start_change_listener() -> bool:
+    from db_logger import start_change_listener
+    return start_change_listener()
+
+
+@st.cache_resource(show_spinner=False)
+def _start_sensor_context_worker() -> bool:
+    from db_logger import start_sensor_context_worker
+    return start_sensor_context_worker()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _load_sensor_context(memo_id, version):
+    from db_logger import fetch_memo_sensor_context
+    return fetch_memo_sensor_context(memo_id)
+
+
+def _sensor_context_panel(memo_id, logged_at):
+    """Stored sensor snapshot for one memo, with a compute button when missing."""
+    try:
+        ctx = _load_sensor_context(memo_id, _version("memo_sensor_context"))
+    except Exception as e:
+        st.caption(f"Sensor context unavailable: {e}")
+        return
+    st.markdown("**SENSOR CONTEXT**")
+    if not ctx:
+        st.caption("No sensor snapshot for this record yet — it is computed once "
+                   "the window after the memo has closed.")
+        if logged_at is not None and st.button("Compute now", key=f"ctx_{memo_id}"):
+            from db_logger import compute_memo_sensor_context
+            try:
+                compute_memo_sensor_context(memo_id, logged_at)
+                st.rerun()
+            except Exception as e:
+                st.error(f"Could not compute sensor context: {e}")
+        return
+    import pandas as pd
+    st.dataframe(pd.DataFrame([{
+        "Tag":        c["tagname"],
+        "Points":     c["n_points"],
+        "Min":        c["min_val"],
+        "Max":        c["max_val"],
+        "Mean":       c["mean_val"],
+        "Std dev":    c["stddev_val"],
+        "Last":       c["last_val"],
+        "Excursions": c["excursions"],
+    } for c in ctx]), use_container_width=True, hide_index=True)
+    st.caption(f"Window {ctx[0]['window_start']:%Y-%m-%d %H:%M} → "
+               f"{ctx[0]['window_end']:%H:%M} UTC · computed "
+               f"{ctx[0]['computed_at']:%Y-%m-%d %H:%M}")
+
+
+# Tables each page reads; the live-refresh fragment watches their versions
+LIVE_PAGES = {
+    "Records": ("memo_log", "memo_sensor_context"),
+    "Actions": ("action_items", "memo_log"),
+    "Gantt":   ("gantt_tasks",),
+}
+
+
+@st.fragment(run_every=1)
+def _live_refresh(tables):
+    """
+    Re-runs the page as soon as the change listener has bumped a table the
+    page reads. Comparing in-memory counters is free, so polling every
+    second costs no database traffic.
+    """
+    if _version(*tables) != st.session_state.get("live_seen"):
+        st.rerun()
+
+
 @st.cache_data(ttl=30, show_spinner=False)
 def _db_ping() -> bool:
     try:
@@ -395,16 +497,66 @@ def _db_ping() -> bool:
         return False
 
 
-@st.cache_data(ttl=30, show_spinner="Loading actions…")
-def _load_actions(eng, status, search):
-    from db_logger import fetch_action_items
-    return fetch_action_items(
+ACTIONS_PAGE_SIZE = 50
+
+
+def _action_filters(eng, status, search) -> dict:
+    return dict(
         engineer = "" if eng    == "All engineers" else eng,
         status   = "" if status == "All statuses"  else status,
         search   = search or "",
     )
 
 
+@st.cache_data(ttl=600, show_spinner="Loading actions…")
+def _load_actions(eng, status, search, cursor, direction, version):
+    from db_logger import fetch_action_page
+    return fetch_action_page(
+        **_action_filters(eng, status, search),
+        page_size = ACTIONS_PAGE_SIZE,
+        cursor    = cursor,
+        direction = direction,
+    )
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _load_action_counts(eng, status, search, version):
+    from db_logger import fetch_action_counts
+    return fetch_action_counts(**_action_filters(eng, status, search))
+
+
+def _grid_key(prefix: str, filters: tuple, page_no: int) -> str:
+    """Grid widget key that changes only on navigation, not when live refresh
+    brings new rows, so a selection survives teammates' writes."""
+    return f"{prefix}_{page_no}_{hashlib.md5(repr(filters).encode()).hexdigest()[:8]}"
+
+
+def _selected_row(selected: list, rows: list, state_key: str):
+    """
+    The row the user selected, followed by id: the grid selection is a row
+    position, and a live refresh that inserts rows above it would otherwise
+    move the open editor onto a different record.
+    """
+    if not selected or selected[0] >= len(rows):
+        st.session_state.pop(state_key, None)
+        return None
+    idx = selected[0]
+    prev = st.session_state.get(state_key)
+    if prev and prev[0] == idx and rows[idx]["id"] != prev[1]:
+        # Same position, different row: data shifted under the selection
+        row = next((r for r in rows if r["id"] == prev[1]), None)
+        if row is not None:
+            return row
+    st.session_state[state_key] = (idx, rows[idx]["id"])
+    return rows[idx]
+
+
+def _clear_record_filters():
+    """on_click callback — runs before the widgets are rebuilt."""
+    for k in ("rf_eng", "rf_act", "rf_sev", "rf_srch", "rf_from", "rf_to"):
+        st.session_state.pop(k, None)
+
+
 def _clear_entry():
     st.session_state.transcript   = ""
     st.session_state.insights     = {}
@@ -462,7 +614,6 @@ def _edit_row(row: dict):
                 "raw_transcript": f_rt,
             })
             st.success(f"Record {row_id} updated.")
-            st.cache_data.clear()
             st.rerun()
         except Exception as e:
             st.error(f"Save error: {e}")
@@ -472,7 +623,6 @@ def _edit_row(row: dict):
             from db_logger import delete_entry
             delete_entry(row_id)
             st.warning(f"Record {row_id} deleted.")
-            st.cache_data.clear()
             st.rerun()
         except Exception as e:
             st.error(f"Delete error: {e}")
@@ -498,10 +648,28 @@ with st.sidebar:
     st.divider()
     db_ok = _db_ping()
     if db_ok:
+        try:
+            _run_migrations()
+        except Exception as e:
+            st.error(f"Schema migration failed: {e}", icon="🔴")
         st.success("DB connected", icon="🟢")
     else:
         st.error("DB offline — check secrets", icon="🔴")
     st.caption("TimescaleDB")
+    if db_ok:
+        from db_logger import pool_stats
+        ps = pool_stats()
+        st.caption(f"Pool: {ps['in_use']} in use · {ps['idle']} idle · max {ps['max_size']}")
+
+        _start_change_listener()
+        _start_sensor_context_worker()
+        live = st.toggle("Live refresh", value=True, key="live_refresh",
+                         help="Reload this page when a teammate changes its data.")
+        if live and page in LIVE_PAGES:
+            # Recorded before the page fetches, so a change that lands
+            # mid-run triggers one extra rerun instead of being missed.
+            st.session_state.live_seen = _version(*LIVE_PAGES[page])
+            _live_refresh(LIVE_PAGES[page])
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -547,13 +715,26 @@ if page == "New Entry":
                      type="primary"):
             with st.spinner("Transcribing with Whisper — this takes ~30 seconds on first run…"):
                 try:
-                    from transcriber import transcribe_file
-                    text = transcribe_file(
+                    from transcriber import transcribe, transcript_cache_stats
+                    result = transcribe(
                         st.session_state.audio_bytes,
                         st.session_state.audio_suffix,
                     )
+                    text = result["text"]
                     st.session_state.transcript = text
-                    st.success(f"Done — {len(text):,} characters.")
+                    st.success(f"Done — {len(text):,} characters"
+                               f"{' (cached)' if result['cached'] else ''}.")
+                    if result.get("vad_missed"):
+                        st.warning("No speech detected in the recording — nothing was "
+                                   "transcribed. Check the audio, or paste the text below.",
+                                   icon="⚠️")
+                    elif result.get("speech_s", 0) < result.get("audio_s", 0):
+                        st.caption(f"Speech {result['speech_s']:.0f} s of "
+                                   f"{result['audio_s']:.0f} s recorded — silence trimmed "
+                                   f"before transcription.")
+                    cs = transcript_cache_stats()
+                    st.caption(f"Transcript cache: {cs['hits']} hits · {cs['misses']} misses · "
+                               f"{cs['entries']} stored ({cs['bytes'] / 1e6:.1f} MB)")
                 except Exception as e:
                     st.error(f"Transcription error: {e}")
 
@@ -663,9 +844,8 @@ if page == "New Entry":
                 }
                 with st.spinner("Saving…"):
                     try:
-                        from db_logger import append_entry, ensure_schema
-                        ensure_schema()
-                        result = append_entry(
+                        from db_logger import save_memo_with_actions
+                        result = save_memo_with_actions(
                             edited,
                             st.session_state.transcript,
                             st.session_state.source_label or "Unknown",
@@ -673,18 +853,10 @@ if page == "New Entry":
                             logged_at=f_date_recorded,  # None → NOW() in DB
                         )
                         ts = result["logged_at"].strftime("%Y-%m-%d %H:%M:%S UTC")
-                        # Auto-create individual action item rows
-                        n_actions = 0
-                        if f_ai.strip():
-                            from db_logger import create_action_items_from_memo
-                            created = create_action_items_from_memo(
-                                result["id"], f_ai, engineer
-                            )
-                            n_actions = len(created)
+                        n_actions = len(result["actions"])
                         action_msg = f" + **{n_actions}** action item{'s' if n_actions != 1 else ''} created." if n_actions else ""
                         st.success(f"✅  Saved! Row ID **{result['id']}** — {ts}{action_msg}")
                         _clear_entry()
-                        st.cache_data.clear()
                         st.rerun()
                     except Exception as e:
                         st.error(f"Database error: {e}")
@@ -704,47 +876,80 @@ elif page == "Records":
     with st.container(border=True):
         st.subheader("FILTERS")
         fc1, fc2, fc3, fc4 = st.columns(4)
-        f_eng  = fc1.selectbox("Engineer", ["All engineers"] + TEAM_MEMBERS)
-        f_act  = fc2.selectbox("Activity Type", ["All types"] + ACTIVITY_OPTIONS)
-        f_sev  = fc3.selectbox("Severity",  ["All severities"] + SEVERITY_OPTIONS)
-        f_srch = fc4.text_input("Keyword search",
-                                placeholder="summary, issues, components…")
-
-        fd1, fd2, fd3 = st.columns(3)
-        f_from = fd1.date_input("From", value=None)
-        f_to   = fd2.date_input("To",   value=None)
-        with fd3:
+        f_eng  = fc1.selectbox("Engineer", ["All engineers"] + TEAM_MEMBERS, key="rf_eng")
+        f_act  = fc2.selectbox("Activity Type", ["All types"] + ACTIVITY_OPTIONS, key="rf_act")
+        f_sev  = fc3.selectbox("Severity",  ["All severities"] + SEVERITY_OPTIONS, key="rf_sev")
+        f_srch = fc4.text_input("Keyword search", key="rf_srch",
+                                placeholder='words, "exact phrase", prefix*',
+                                help='Full-text search over summary, issues, maintenance, '
+                                     'components and transcript. Use OR between alternatives.')
+
+        fd1, fd2, fd3, fd4 = st.columns([3, 3, 2, 4])
+        f_from = fd1.date_input("From", value=None, key="rf_from")
+        f_to   = fd2.date_input("To",   value=None, key="rf_to")
+        f_page_size = fd3.selectbox("Per page", [25, 50, 100], key="rec_page_size")
+        with fd4:
             st.write("")
             st.write("")
             ac1, ac2 = st.columns(2)
-            do_apply = ac1.button("Apply",  type="primary",   use_container_width=True)
-            do_clear = ac2.button("Clear filters",            use_container_width=True)
-
-    if do_clear:
-        st.cache_data.clear()
-        st.rerun()
-    if do_apply:
-        st.cache_data.clear()
+            # Filters apply on change; the button just gives a rerun to click
+            ac1.button("Apply",  type="primary",   use_container_width=True)
+            ac2.button("Clear filters", use_container_width=True,
+                       on_click=_clear_record_filters)
+
+    # ── Paging state — back to the first page whenever the filters change ────
+    filter_key = (f_eng, f_act, f_sev, f_srch, f_from, f_to, f_page_size)
+    if st.session_state.get("rec_filter_key") != filter_key:
+        st.session_state.rec_filter_key = filter_key
+        st.session_state.rec_cursor     = None
+        st.session_state.rec_direction  = "next"
+        st.session_state.rec_page_no    = 1
 
     # ── Fetch ─────────────────────────────────────────────────────────────────
     try:
-        rows = _load_records(f_eng, f_act, f_sev, f_srch, f_from, f_to)
+        page_data = _load_records(f_eng, f_act, f_sev, f_srch, f_from, f_to,
+                                  f_page_size, st.session_state.rec_cursor,
+                                  st.session_state.rec_direction,
+                                  _version("memo_log"))
     except Exception as e:
         st.error(f"Could not load records: {e}")
-        rows = []
+        page_data = {"rows": [], "first": None, "last": None,
+                     "has_prev": False, "has_next": False}
+    rows = page_data["rows"]
+    if not page_data["has_prev"]:
+        st.session_state.rec_page_no = 1
 
     # ── Toolbar ───────────────────────────────────────────────────────────────
-    tc1, tc2 = st.columns([4, 1])
-    tc1.caption(f"**{len(rows)}** record{'s' if len(rows) != 1 else ''}")
+    tc1, tc2, tc3, tc4, tc5 = st.columns([4, 1, 1, 1, 1])
+    tc1.caption(f"Page **{st.session_state.rec_page_no}**  ·  "
+                f"**{len(rows)}** record{'s' if len(rows) != 1 else ''}")
+
+    if tc2.button("◀  Previous", use_container_width=True,
+                  disabled=not page_data["has_prev"], key="rec_prev"):
+        st.session_state.rec_cursor    = page_data["first"]
+        st.session_state.rec_direction = "prev"
+        st.session_state.rec_page_no   = max(1, st.session_state.rec_page_no - 1)
+        st.rerun()
+    if tc3.button("Next  ▶", use_container_width=True,
+                  disabled=not page_data["has_next"], key="rec_next"):
+        st.session_state.rec_cursor    = page_data["last"]
+        st.session_state.rec_direction = "next"
+        st.session_state.rec_page_no  += 1
+        st.rerun()
 
-    if tc2.button("📊  Export Excel", use_container_width=True):
-        if not rows:
-            st.warning("No records to export.")
-        else:
-            try:
+    if tc4.button("📊  Export Excel", use_container_width=True):
+        try:
+            from db_logger import fetch_filtered_rows
+            export_rows = fetch_filtered_rows(
+                **_record_filters(f_eng, f_act, f_sev, f_srch, f_from, f_to),
+                limit=None,
+            )
+            if not export_rows:
+                st.warning("No records to export.")
+            else:
                 from excel_export import export_to_excel
                 with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp:
-                    export_to_excel(rows, tmp.name)
+                    export_to_excel(export_rows, tmp.name)
                     excel_bytes = open(tmp.name, "rb").read()
                 fname = f"memo_log_{datetime.now():%Y%m%d_%H%M}.xlsx"
                 st.download_button(
@@ -752,26 +957,64 @@ elif page == "Records":
                     data=excel_bytes, file_name=fname,
                     mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 )
-            except Exception as e:
-                st.error(f"Export error: {e}")
+        except Exception as e:
+            st.error(f"Export error: {e}")
+
+    if tc5.button("📈  Backfill sensors", use_container_width=True,
+                  help="Compute sensor context for up to 500 older records that have none."):
+        try:
+            from db_logger import backfill_sensor_context
+            with st.spinner("Computing sensor context…"):
+                n_done = backfill_sensor_context(limit=500)
+            st.success(f"Sensor context computed for {n_done} record{'s' if n_done != 1 else ''}.")
+        except Exception as e:
+            st.error(f"Backfill error: {e}")
 
-    # ── Records list ──────────────────────────────────────────────────────────
+    # ── Records grid ──────────────────────────────────────────────────────────
     st.divider()
     if not rows:
         st.info("No records match your filters.", icon="ℹ️")
     else:
-        for row in rows:
-            ts    = row.get("logged_at")
-            ts_str= ts.strftime("%Y-%m-%d  %H:%M UTC") if hasattr(ts,"strftime") else str(ts)
-            sev   = row.get("severity","") or ""
-            badge = SEV_BADGE.get(sev,"⚪")
-            summary_preview = (row.get("summary") or "")[:90]
+        import pandas as pd
+
+        grid = pd.DataFrame([{
+            "":                SEV_BADGE.get(r.get("severity") or "", "⚪"),
+            "Timestamp (UTC)": (r["logged_at"].strftime("%Y-%m-%d %H:%M")
+                                if hasattr(r.get("logged_at"), "strftime") else str(r.get("logged_at"))),
+            "Engineer":        r.get("engineer", "") or "",
+            "Activity":        r.get("activity_type", "") or "",
+            "Severity":        r.get("severity", "") or "",
+            "Summary":         r.get("summary_preview", "") or "",
+            **({"Match": (r.get("search_snippet") or "").replace("**", "")}
+               if f_srch else {}),
+        } for r in rows])
+        # Keyed on filters and page so a new page starts unselected
+        event = st.dataframe(
+            grid, use_container_width=True, hide_index=True,
+            on_select="rerun", selection_mode="single-row",
+            key=_grid_key("rec_grid", filter_key, st.session_state.rec_page_no),
+        )
 
-            act_label = row.get("activity_type","") or ""
-            with st.expander(
-                f"{badge}  **{ts_str}**  ·  {row.get('engineer','')}  ·  {act_label}  ·  {summary_preview}"
-            ):
-                _edit_row(row)
+        # ── Detail editor for the selected row only ───────────────────────────
+        row = _selected_row(event.selection.rows, rows, "rec_selected")
+        if row is None:
+            st.caption("Select a row to view and edit the full record.")
+        else:
+            with st.container(border=True):
+                st.subheader("RECORD DETAIL")
+                if row.get("search_snippet"):
+                    st.markdown(f"🔎  {row['search_snippet']}")
+                try:
+                    full = _load_entry(row["id"], row.get("logged_at"),
+                                       _version("memo_log"))
+                except Exception as e:
+                    st.error(f"Could not load record: {e}")
+                    full = None
+                if full is None:
+                    st.warning(f"Record {row['id']} could not be loaded.")
+                else:
+                    _edit_row(full)
+                    _sensor_context_panel(full["id"], full.get("logged_at"))
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -787,7 +1030,7 @@ elif page == "Actions":
         fc1, fc2, fc3, fc4 = st.columns([2, 2, 2, 3])
         f_a_eng    = fc1.selectbox("Engineer",  ["All engineers"] + TEAM_MEMBERS, key="af_eng")
         f_a_status = fc2.selectbox("Status",    ["All statuses"]  + STATUS_OPTIONS, key="af_sta")
-        f_a_search = fc3.text_input("Search",   placeholder="keyword…", key="af_srch")
+        f_a_search = fc3.text_input("Search",   placeholder='keyword, "phrase", prefix*', key="af_srch")
         with fc4:
             st.write("")
             ac1, ac2, ac3 = st.columns(3)
@@ -796,7 +1039,10 @@ elif page == "Actions":
                                     type="primary")
 
     if do_refresh:
-        st.cache_data.clear()
+        # Catches writes the change listener may have missed. A version bump
+        # is one counter; the loaders refetch only the queries in use.
+        from db_logger import bump_data_version
+        bump_data_version("action_items", "memo_log")
         st.rerun()
 
     # ── Manual add form ───────────────────────────────────────────────────────
@@ -828,7 +1074,6 @@ elif page == "Actions":
                         )
                         st.success(f"Action item added.")
                         st.session_state["show_add_form"] = False
-                        st.cache_data.clear()
                         st.rerun()
                     except Exception as e:
                         st.error(f"Error: {e}")
@@ -836,137 +1081,164 @@ elif page == "Actions":
                 st.session_state["show_add_form"] = False
                 st.rerun()
 
-    # ── Load and display action items ─────────────────────────────────────────
+    # ── Paging state — back to the first page whenever the filters change ────
+    af_key = (f_a_eng, f_a_status, f_a_search)
+    if st.session_state.get("af_filter_key") != af_key:
+        st.session_state.af_filter_key = af_key
+        st.session_state.af_cursor     = None
+        st.session_state.af_direction  = "next"
+        st.session_state.af_page_no    = 1
+
+    # ── Load action items ─────────────────────────────────────────────────────
     try:
-        actions = _load_actions(f_a_eng, f_a_status, f_a_search)
+        act_page = _load_actions(f_a_eng, f_a_status, f_a_search,
+                                 st.session_state.af_cursor,
+                                 st.session_state.af_direction,
+                                 _version("action_items", "memo_log"))
+        counts   = _load_action_counts(f_a_eng, f_a_status, f_a_search,
+                                       _version("action_items"))
     except Exception as e:
         st.error(f"Could not load actions: {e}")
-        actions = []
+        act_page = {"rows": [], "first": None, "last": None,
+                    "has_prev": False, "has_next": False}
+        counts   = {}
+    actions = act_page["rows"]
+    if not act_page["has_prev"]:
+        st.session_state.af_page_no = 1
 
     # Summary counts
-    if actions:
-        total     = len(actions)
-        n_ns      = sum(1 for a in actions if a.get("status") == "Not Started")
-        n_ip      = sum(1 for a in actions if a.get("status") == "In Progress")
-        n_done    = sum(1 for a in actions if a.get("status") == "Complete")
-
+    if counts:
         mc1, mc2, mc3, mc4 = st.columns(4)
-        mc1.metric("Total",       total)
-        mc2.metric("⬜ Not Started", n_ns)
-        mc3.metric("🔵 In Progress", n_ip)
-        mc4.metric("✅ Complete",    n_done)
+        mc1.metric("Total",          sum(counts.values()))
+        mc2.metric("⬜ Not Started", counts.get("Not Started", 0))
+        mc3.metric("🔵 In Progress", counts.get("In Progress", 0))
+        mc4.metric("✅ Complete",    counts.get("Complete", 0))
         st.divider()
 
     if not actions:
         st.info("No action items found. Action items are auto-created when you save a new entry, "
                 "or you can add them manually above.", icon="ℹ️")
     else:
-        # Group by status for visual clarity
-        groups = [
-            ("🔵  In Progress",  "In Progress"),
-            ("⬜  Not Started",  "Not Started"),
-            ("✅  Complete",     "Complete"),
-        ]
+        import pandas as pd
+
+        # ── Toolbar ───────────────────────────────────────────────────────────
+        pc1, pc2, pc3 = st.columns([5, 1, 1])
+        pc1.caption(f"Page **{st.session_state.af_page_no}**  ·  "
+                    f"**{len(actions)}** item{'s' if len(actions) != 1 else ''}")
+        if pc2.button("◀  Previous", use_container_width=True,
+                      disabled=not act_page["has_prev"], key="af_prev"):
+            st.session_state.af_cursor    = act_page["first"]
+            st.session_state.af_direction = "prev"
+            st.session_state.af_page_no   = max(1, st.session_state.af_page_no - 1)
+            st.rerun()
+        if pc3.button("Next  ▶", use_container_width=True,
+                      disabled=not act_page["has_next"], key="af_next"):
+            st.session_state.af_cursor    = act_page["last"]
+            st.session_state.af_direction = "next"
+            st.session_state.af_page_no  += 1
+            st.rerun()
 
-        for group_label, group_status in groups:
-            group_items = [a for a in actions if a.get("status") == group_status]
-            if not group_items:
-                continue
+        def _d(v, fmt):
+            return v.strftime(fmt) if hasattr(v, "strftime") else (str(v) if v else "")
+
+        grid = pd.DataFrame([{
+            "":            STATUS_BADGE.get(a.get("status"), "⬜"),
+            "Status":      a.get("status", ""),
+            "Action":      a.get("action_text", ""),
+            "Assigned":    a.get("engineer", "") or "—",
+            "Responsible": a.get("responsible", "") or "",
+            "Due":         _d(a.get("due_date"), "%Y-%m-%d"),
+            "Updated":     _d(a.get("updated_at"), "%Y-%m-%d %H:%M"),
+            "Memo":        (a.get("memo_summary") or "")[:60],
+        } for a in actions])
+        event = st.dataframe(
+            grid, use_container_width=True, hide_index=True,
+            on_select="rerun", selection_mode="single-row",
+            key=_grid_key("af_grid", af_key, st.session_state.af_page_no),
+        )
 
-            st.subheader(f"{group_label}  ({len(group_items)})")
-
-            for action in group_items:
-                item_id    = action["id"]
-                act_text   = action.get("action_text", "")
-                cur_status = action.get("status", "Not Started")
-                cur_notes  = action.get("notes", "") or ""
-                eng_name   = action.get("engineer", "") or "—"
-                upd        = action.get("updated_at")
-                upd_str    = upd.strftime("%Y-%m-%d %H:%M") if hasattr(upd, "strftime") else str(upd or "")
-                memo_sum   = (action.get("memo_summary") or "")[:60]
-                memo_id    = action.get("memo_id")
-                badge      = STATUS_BADGE.get(cur_status, "⬜")
-
-                cur_resp_label = action.get("responsible","") or ""
-                cur_due_label  = action.get("due_date")
-                due_label_str  = f"  ·  due {cur_due_label.strftime('%b %d')}" if hasattr(cur_due_label,"strftime") else ""
-                exp_label = (f"{badge}  {act_text[:70]}{'…' if len(act_text) > 70 else ''}"
-                             f"  ·  *{eng_name}*{due_label_str}")
-                if cur_resp_label and cur_resp_label != eng_name:
-                    exp_label += f"  ·  resp: {cur_resp_label}"
-                if memo_sum:
-                    exp_label += f"  ·  _{memo_sum[:50]}_"
-
-                with st.expander(exp_label):
-                    # Full action text (read-only display, editable below)
-                    st.markdown(f"**Action:** {act_text}")
-                    ic1, ic2, ic3, ic4 = st.columns(4)
-                    ic1.caption(f"Assigned to: **{eng_name}**")
-                    cur_resp = action.get("responsible","") or "—"
-                    ic2.caption(f"Responsible: **{cur_resp}**")
-                    cur_due  = action.get("due_date")
-                    due_str  = cur_due.strftime("%Y-%m-%d") if hasattr(cur_due,"strftime") else (str(cur_due) if cur_due else "—")
-                    ic3.caption(f"Due: **{due_str}**")
-                    ic4.caption(f"Updated: {upd_str}")
-                    if memo_id:
-                        st.caption(f"From memo ID: {memo_id}" +
-                                   (f" — {memo_sum}" if memo_sum else ""))
-                    st.write("")
-
-                    # Inline status update form
-                    with st.form(key=f"action_form_{item_id}"):
-                        sf1, sf2, sf3, sf4 = st.columns([1, 2, 2, 2])
-                        new_status = sf1.selectbox(
-                            "Status",
-                            STATUS_OPTIONS,
-                            index=STATUS_OPTIONS.index(cur_status)
-                                  if cur_status in STATUS_OPTIONS else 0,
-                            key=f"sel_{item_id}",
-                        )
-                        resp_idx = TEAM_MEMBERS.index(cur_resp) if cur_resp in TEAM_MEMBERS else 0
-                        new_resp = sf2.selectbox(
-                            "Responsible",
-                            TEAM_MEMBERS,
-                            index=resp_idx,
-                            key=f"resp_{item_id}",
-                        )
-                        new_due = sf3.date_input(
-                            "Due Date",
-                            value=cur_due if cur_due else None,
-                            key=f"due_{item_id}",
-                        )
-                        new_notes = sf4.text_input(
-                            "Notes",
-                            value=cur_notes,
-                            placeholder="Progress notes, blockers…",
-                            key=f"notes_{item_id}",
-                        )
-                        bf1, bf2, _ = st.columns([1, 1, 4])
-                        do_update = bf1.form_submit_button(
-                            "💾  Save", type="primary", use_container_width=True)
-                        do_del    = bf2.form_submit_button(
-                            "🗑  Delete", use_container_width=True)
+        # ── Detail editor for the selected item only ──────────────────────────
+        action = _selected_row(event.selection.rows, actions, "af_selected")
+        if action is None:
+            st.caption("Select an action item to update its status, owner, due date or notes.")
+        else:
+            item_id    = action["id"]
+            act_text   = action.get("action_text", "")
+            cur_status = action.get("status", "Not Started")
+            cur_notes  = action.get("notes", "") or ""
+            eng_name   = action.get("engineer", "") or "—"
+            upd_str    = _d(action.get("updated_at"), "%Y-%m-%d %H:%M")
+            memo_sum   = (action.get("memo_summary") or "")[:60]
+            memo_id    = action.get("memo_id")
+
+            with st.container(border=True):
+                st.subheader(f"{STATUS_BADGE.get(cur_status, '⬜')}  ACTION #{item_id}")
+                st.markdown(f"**Action:** {act_text}")
+                if action.get("search_snippet"):
+                    st.markdown(f"🔎  {action['search_snippet']}")
+                ic1, ic2, ic3, ic4 = st.columns(4)
+                ic1.caption(f"Assigned to: **{eng_name}**")
+                cur_resp = action.get("responsible","") or "—"
+                ic2.caption(f"Responsible: **{cur_resp}**")
+                cur_due  = action.get("due_date")
+                ic3.caption(f"Due: **{_d(cur_due, '%Y-%m-%d') or '—'}**")
+                ic4.caption(f"Updated: {upd_str}")
+                if memo_id:
+                    st.caption(f"From memo ID: {memo_id}" +
+                               (f" — {memo_sum}" if memo_sum else ""))
+                st.write("")
+
+                with st.form(key=f"action_form_{item_id}"):
+                    sf1, sf2, sf3, sf4 = st.columns([1, 2, 2, 2])
+                    new_status = sf1.selectbox(
+                        "Status",
+                        STATUS_OPTIONS,
+                        index=STATUS_OPTIONS.index(cur_status)
+                              if cur_status in STATUS_OPTIONS else 0,
+                        key=f"sel_{item_id}",
+                    )
+                    resp_idx = TEAM_MEMBERS.index(cur_resp) if cur_resp in TEAM_MEMBERS else 0
+                    new_resp = sf2.selectbox(
+                        "Responsible",
+                        TEAM_MEMBERS,
+                        index=resp_idx,
+                        key=f"resp_{item_id}",
+                    )
+                    new_due = sf3.date_input(
+                        "Due Date",
+                        value=cur_due if cur_due else None,
+                        key=f"due_{item_id}",
+                    )
+                    new_notes = sf4.text_input(
+                        "Notes",
+                        value=cur_notes,
+                        placeholder="Progress notes, blockers…",
+                        key=f"notes_{item_id}",
+                    )
+                    bf1, bf2, _ = st.columns([1, 1, 4])
+                    do_update = bf1.form_submit_button(
+                        "💾  Save", type="primary", use_container_width=True)
+                    do_del    = bf2.form_submit_button(
+                        "🗑  Delete", use_container_width=True)
 
-                    if do_update:
-                        try:
-                            from db_logger import update_action_item
-                            update_action_item(item_id, new_status, new_notes,
-                                               new_resp, new_due)
-                            st.success("Updated.")
-                            st.cache_data.clear()
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error: {e}")
+                if do_update:
+                    try:
+                        from db_logger import update_action_item
+                        update_action_item(item_id, new_status, new_notes,
+                                           new_resp, new_due)
+                        st.success("Updated.")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Error: {e}")
 
-                    if do_del:
-                        try:
-                            from db_logger import delete_action_item
-                            delete_action_item(item_id)
-                            st.warning("Action item deleted.")
-                            st.cache_data.clear()
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error: {e}")
+                if do_del:
+                    try:
+                        from db_logger import delete_action_item
+                        delete_action_item(item_id)
+                        st.warning("Action item deleted.")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Error: {e}")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -992,6 +1264,7 @@ elif page == "Ask Weebo":
             "Show me every entry that mentions the pressure sensor",
             "How many hours of maintenance did we log in total?",
             "What were the most common components affected across all entries?",
+            "What was M130_RefFreq doing around the Critical entries last month?",
         ]
         cols = st.columns(2)
         for i, ex in enumerate(examples):
@@ -1178,10 +1451,7 @@ elif page == "Gantt":
     from config import ANTHROPIC_API_KEY, CLAUDE_MODEL
     from db_logger import (fetch_gantt_tasks, create_gantt_task,
                             update_gantt_task, delete_gantt_task,
-                            bulk_insert_gantt_tasks, ensure_gantt_schema,
-                            fetch_action_items)
-
-    ensure_gantt_schema()
+                            bulk_insert_gantt_tasks, fetch_action_items)
 
     st.header("GANTT CHART")
     st.caption("Project schedule with dependencies. Edit tasks inline or sync from action items.")
@@ -1196,11 +1466,11 @@ elif page == "Gantt":
     GANTT_STATUS_OPTIONS = ["Not Started", "In Progress", "Complete", "Blocked"]
 
     # ── Load tasks ────────────────────────────────────────────────────────────
-    @st.cache_data(ttl=15, show_spinner=False)
-    def _load_gantt():
+    @st.cache_data(ttl=600, show_spinner=False)
+    def _load_gantt(version):
         return fetch_gantt_tasks()
 
-    tasks = _load_gantt()
+    tasks = _load_gantt(_version("gantt_tasks"))
 
     # ─────────────────────────────────────────────────────────────────────────
     # CHART
@@ -1445,7 +1715,6 @@ Return only the JSON array of task objects."""
                                     })
 
                         st.success(f"✅ {len(proposed)} tasks added to Gantt.")
-                        st.cache_data.clear()
                         st.rerun()
 
                 except json.JSONDecodeError as e:
@@ -1501,7 +1770,6 @@ Return only the JSON array of task objects."""
                         "notes":       g_notes,
                     })
                     st.success(f"Task '{g_title}' added.")
-                    st.cache_data.clear()
                     st.rerun()
                 except Exception as e:
                     st.error(f"Error: {e}")
@@ -1576,7 +1844,6 @@ Return only the JSON array of task objects."""
                                     "notes":        fe_notes,
                                 })
                                 st.success(f"Task #{tid} updated.")
-                                st.cache_data.clear()
                                 st.rerun()
                             except Exception as e:
                                 st.error(f"Error: {e}")
@@ -1585,7 +1852,6 @@ Return only the JSON array of task objects."""
                         try:
                             delete_gantt_task(tid)
                             st.warning(f"Task #{tid} deleted.")
-                            st.cache_data.clear()
                             st.rerun()
                         except Exception as e:
                             st.error(f"Error: {e}")
@@ -1598,7 +1864,21 @@ elif page == "Sensor View":
     import pandas as pd
     import plotly.graph_objects as go
     from datetime import datetime, timedelta, timezone
-    from db_logger import fetch_sensor_data, fetch_observations_in_window
+    import time
+    import numpy as np
+    from config import SENSOR_WEBGL_THRESHOLD, SENSOR_CHART_PX
+    from sensors import (append_tail, decimate, slice_range, parse_expression,
+                         ExpressionError, NotPushable)
+    from db_logger import (fetch_sensor_arrays, fetch_sensor_tail,
+                           fetch_observation_overlay, fetch_sensor_derived,
+                           plan_sensor_query, sensor_cache_stats,
+                           tag_catalog, search_tags, unknown_tags)
+
+    def _plan_label(plan):
+        label = f"{plan['label']} ({plan['table']})"
+        if plan["bucket"] is not None:
+            label += f", {plan['bucket']} buckets (min / max / avg)"
+        return label
 
     st.header("SENSOR VIEW")
     st.caption("Process tag data with qualitative observation overlays from voice memos.")
@@ -1614,6 +1894,16 @@ elif page == "Sensor View":
         sv_st = tc2.time_input("Start Time", value=default_start.replace(second=0, microsecond=0).time(), key="sv_st")
         sv_ed = tc3.date_input("End Date",   value=now_utc.date(), key="sv_ed")
         sv_et = tc4.time_input("End Time",   value=now_utc.replace(second=0, microsecond=0).time(), key="sv_et")
+        sv_points = st.number_input(
+            "Points per tag", min_value=0, max_value=20000, value=1500, step=250,
+            key="sv_points",
+            help="Roughly the chart width in pixels. Longer windows are bucketed "
+                 "server-side to this many points (min / max / avg). 0 = full resolution.",
+        )
+        sv_raw = st.checkbox(
+            "Draw every point", key="sv_raw",
+            help="Skip min/max decimation in the browser. Slow for long windows.",
+        )
 
     start_dt = datetime(sv_sd.year, sv_sd.month, sv_sd.day,
                         sv_st.hour, sv_st.minute, tzinfo=timezone.utc)
@@ -1622,13 +1912,13 @@ elif page == "Sensor View":
 
     duration = end_dt - start_dt
     if duration.total_seconds() > 0:
-        if duration > timedelta(hours=4):
-            res_label = "15-sec aggregates"
-        elif duration >= timedelta(minutes=31):
-            res_label = "1-sec aggregates"
-        else:
-            res_label = "raw data"
-        st.caption(f"Window: {duration}  ·  Resolution: {res_label}")
+        n_tags = sum(1 for t in st.session_state.get("sv_tags", []) if t["db_name"].strip()) or 1
+        try:
+            plan = plan_sensor_query(start_dt, end_dt, sv_points or None, n_tags)
+            st.caption(f"Window: {duration}  ·  Resolution: {_plan_label(plan)}"
+                       f"  ·  ~{plan['est_rows']:,} rows")
+        except Exception as e:
+            st.caption(f"Window: {duration}  ·  Resolution: unavailable ({e})")
 
     # ── Tag configuration ─────────────────────────────────────────────────────
     if "sv_tags" not in st.session_state:
@@ -1636,6 +1926,8 @@ elif page == "Sensor View":
             {"db_name": "M130_RefFreq", "display": "MC130_SP",  "scale": round(5.0 / 3, 4)},
             {"db_name": "AO_AOV140",    "display": "AOV140_SP", "scale": 1.0},
         ]
+    if "sv_derived" not in st.session_state:
+        st.session_state.sv_derived = []
 
     with st.container(border=True):
         st.subheader("TAGS")
@@ -1662,152 +1954,439 @@ elif page == "Sensor View":
             st.session_state.sv_tags.pop(idx)
             st.rerun()
 
-        if st.button("＋  Add Tag", key="sv_add"):
-            st.session_state.sv_tags.append({"db_name": "", "display": "", "scale": 1.0})
+        try:
+            catalog = tag_catalog()
+        except Exception as e:
+            catalog = None
+            st.caption(f"Tag catalog unavailable: {e}")
+
+        if catalog is not None:
+            typed = [t["db_name"].strip() for t in st.session_state.sv_tags if t["db_name"].strip()]
+            for name, close in unknown_tags(typed).items():
+                hint = f" — did you mean {', '.join(f'`{c}`' for c in close)}?" if close else ""
+                st.warning(f"Unknown tag `{name}`{hint}", icon="⚠️")
+
+        def _tag_option(name):
+            info = catalog.get(name, {}) if catalog else {}
+            extra = "  ·  ".join(x for x in (info.get("description"), info.get("units")) if x)
+            return f"{name}  —  {extra}" if extra else name
+
+        pc1, pc2, pc3 = st.columns([3, 5, 1])
+        tag_q = pc1.text_input("Find tag", key="sv_tag_q", placeholder="Name or description…")
+        tag_pick = pc2.selectbox(
+            "Matches", search_tags(tag_q) if catalog is not None else [],
+            index=None, format_func=_tag_option, key="sv_tag_pick",
+            placeholder="Pick a tag, or Add for a blank row",
+        )
+        pc3.markdown("<br>", unsafe_allow_html=True)
+        if pc3.button("＋  Add Tag", key="sv_add", use_container_width=True):
+            st.session_state.sv_tags.append(
+                {"db_name": tag_pick or "", "display": tag_pick or "", "scale": 1.0})
+            st.rerun()
+
+        # ── Derived tags ──
+        st.markdown("**Derived**")
+        st.caption('Expressions over DB tag names, e.g. `M130_RefFreq * 5/3 - AO_AOV140`, '
+                   '`rolling_mean(AO_AOV140, "5min")`, `rate(M130_RefFreq)`. Functions: '
+                   '`abs sqrt log exp min max rolling_mean rate delta`. Backtick odd names.')
+        derived_to_remove = []
+        for i, d in enumerate(st.session_state.sv_derived):
+            dc1, dc2, dc3 = st.columns([3, 6, 1])
+            new_name = dc1.text_input("name", value=d["name"], key=f"sv_dname_{i}",
+                                      label_visibility="collapsed", placeholder="Label")
+            new_expr = dc2.text_input("expr", value=d["expr"], key=f"sv_dexpr_{i}",
+                                      label_visibility="collapsed", placeholder="Expression")
+            if dc3.button("✕", key=f"sv_drm_{i}", use_container_width=True):
+                derived_to_remove.append(i)
+            st.session_state.sv_derived[i] = {"name": new_name, "expr": new_expr}
+            if new_expr.strip():
+                try:
+                    refs = parse_expression(new_expr.strip()).tags
+                    for name, close in (unknown_tags(refs).items() if catalog is not None else []):
+                        hint = f" — did you mean {', '.join(f'`{c}`' for c in close)}?" if close else ""
+                        dc2.warning(f"Unknown tag `{name}`{hint}", icon="⚠️")
+                except ExpressionError as e:
+                    dc2.error(str(e), icon="⚠️")
+
+        for idx in sorted(derived_to_remove, reverse=True):
+            st.session_state.sv_derived.pop(idx)
+            st.rerun()
+
+        if st.button("＋  Add Derived", key="sv_dadd"):
+            st.session_state.sv_derived.append({"name": "", "expr": ""})
             st.rerun()
 
+    def _derived_exprs():
+        """[(label, DerivedExpr)] for rows that parse; broken rows are skipped."""
+        out = []
+        for d in st.session_state.sv_derived:
+            if d["expr"].strip():
+                try:
+                    out.append((d["name"].strip() or d["expr"].strip(),
+                                parse_expression(d["expr"].strip())))
+                except ExpressionError:
+                    pass
+        return out
+
+    def _derive(series, exprs, plan, start, end, pushed=()):
+        """
+        Evaluate derived tags. Expressions whose text is in pushed run as
+        SQL window functions; the rest evaluate vectorized on series. Returns
+        ({key: entry}, pseudo-tags for the chart, milliseconds).
+        """
+        t0 = time.perf_counter()
+        out, pseudo = {}, []
+        for label, expr in exprs:
+            key = f"= {label}"
+            if expr.text in pushed:
+                out[key] = fetch_sensor_derived(start, end, expr.tags[0], expr.to_sql(),
+                                                timedelta(seconds=expr.lookback), plan)
+            else:
+                out[key] = slice_range(expr.evaluate(series), start, end)
+            pseudo.append({"db_name": key, "display": label, "scale": 1.0})
+        return out, pseudo, (time.perf_counter() - t0) * 1000
+
     # ── Fetch button ──────────────────────────────────────────────────────────
-    sv_fetch = st.button("FETCH DATA", type="primary", key="sv_fetch")
+    fc1, fc2, fc3, fc4 = st.columns([2, 1, 1, 1])
+    sv_fetch = fc1.button("FETCH DATA", type="primary", key="sv_fetch")
+    sv_live  = fc2.toggle("Live tail", key="sv_live",
+                          help="Follow the last N minutes, polling only for new points.")
+    sv_live_minutes = fc3.number_input("Last N minutes", min_value=1, max_value=240,
+                                       value=30, key="sv_live_minutes")
+    sv_live_every   = fc4.number_input("Poll every (s)", min_value=1, max_value=60,
+                                       value=5, key="sv_live_every")
 
     if "sv_result" not in st.session_state:
         st.session_state.sv_result = None
-        st.session_state.sv_obs    = None
+        st.session_state.sv_tail   = None
 
-    if sv_fetch:
+    if sv_fetch and not sv_live:
         if end_dt <= start_dt:
             st.error("End time must be after start time.")
         else:
             valid_tags = [t for t in st.session_state.sv_tags if t["db_name"].strip()]
-            if not valid_tags:
+            exprs      = _derived_exprs()
+            db_names   = list(dict.fromkeys(t["db_name"].strip() for t in valid_tags))
+            refs       = [tag for _, e in exprs for tag in e.tags]
+            unknown = unknown_tags(db_names + refs) if catalog is not None else {}
+            if not valid_tags and not exprs:
                 st.warning("Add at least one tag with a DB Tag Name.")
+            elif unknown:
+                st.error(f"Fix unknown tag(s) before fetching: {', '.join(unknown)}")
             else:
                 with st.spinner("Fetching sensor data…"):
                     try:
-                        db_names = [t["db_name"].strip() for t in valid_tags]
-                        rows     = fetch_sensor_data(start_dt, end_dt, db_names)
-                        obs      = fetch_observations_in_window(start_dt, end_dt)
-                        st.session_state.sv_result = {"rows": rows, "tags": valid_tags}
-                        st.session_state.sv_obs    = obs
+                        plan = plan_sensor_query(start_dt, end_dt, sv_points or None,
+                                                 len(db_names) + len(exprs))
+                        # Single-tag expressions over a tag that is not plotted
+                        # anyway run in SQL, so its raw series is never shipped.
+                        pushed = set()
+                        if plan["bucket"] is None:
+                            for _, e in exprs:
+                                try:
+                                    e.to_sql()
+                                except NotPushable:
+                                    continue
+                                if e.tags[0] not in db_names:
+                                    pushed.add(e.text)
+                        needed = list(dict.fromkeys(
+                            db_names + [tag for _, e in exprs if e.text not in pushed for tag in e.tags]))
+                        lookback = max([e.lookback for _, e in exprs if e.text not in pushed] or [0])
+                        series = fetch_sensor_arrays(start_dt - timedelta(seconds=lookback), end_dt,
+                                                     needed, plan=plan) if needed else {}
+                        derived, pseudo, derive_ms = _derive(series, exprs, plan, start_dt, end_dt,
+                                                             pushed)
+                        series = {k: slice_range(v, start_dt, None) for k, v in series.items()}
+                        series.update(derived)
+                        st.session_state.sv_result = {
+                            "series": series, "tags": valid_tags + pseudo,
+                            "plan": plan, "window": (start_dt, end_dt),
+                            "derived": (len(exprs), len(pushed), derive_ms),
+                        }
+                        st.session_state.sv_zoom   = None
                     except Exception as e:
                         st.error(f"Error fetching data: {e}")
                         st.session_state.sv_result = None
 
     # ── Chart ─────────────────────────────────────────────────────────────────
-    sv_result = st.session_state.get("sv_result")
-    sv_obs    = st.session_state.get("sv_obs") or []
-
-    if sv_result is not None:
-        rows = sv_result["rows"]
-        tags = sv_result["tags"]
-
-        if not rows:
-            st.info("No sensor data found for the selected tags and time window.", icon="ℹ️")
-        else:
-            df = pd.DataFrame(rows)
-            df["time"] = pd.to_datetime(df["time"], utc=True)
-            df["val"]  = pd.to_numeric(df["val"], errors="coerce")
-
-            # Apply scale factors
-            scale_map   = {t["db_name"]: t["scale"]   for t in tags}
-            display_map = {t["db_name"]: t["display"]  for t in tags}
-            df["scaled"] = df.apply(lambda r: r["val"] * scale_map.get(r["tagname"], 1.0), axis=1)
-            df["label"]  = df["tagname"].map(display_map)
-
-            # Pivot to one column per tag
-            pivot = (df.pivot_table(index="time", columns="label", values="scaled", aggfunc="mean")
-                       .reset_index())
-
-            TRACE_COLOURS = ["#c9a84c", "#5a9abf", "#7c6a9a", "#4a9a6a", "#bf5a5a", "#9abf5a"]
-            fig = go.Figure()
-
-            display_cols = [t["display"] for t in tags if t["display"] in pivot.columns]
-            for idx, col in enumerate(display_cols):
-                colour  = TRACE_COLOURS[idx % len(TRACE_COLOURS)]
-                col_df  = pivot[["time", col]].dropna()
-                fig.add_trace(go.Scatter(
-                    x=col_df["time"],
-                    y=col_df[col],
-                    mode="lines",
-                    name=col,
-                    line=dict(color=colour, width=1.5),
-                    hovertemplate=f"<b>{col}</b>  %{{y:.3f}}<extra></extra>",
+    SEVERITY_COLOUR = {"Critical": "#bf5a5a", "High": "#c9783c", "Medium": "#c9a84c",
+                       "Low": "#5a9abf", "None": "#5a6070"}
+
+    @st.cache_data(ttl=600, show_spinner=False)
+    def _load_obs_overlay(lo, hi, version):
+        return fetch_observation_overlay(lo, hi)
+
+    def _sensor_figure(series, tags, zoom, overlay, keep=None, sig=None):
+        """
+        Decimate series and build the chart figure. Returns (figure, column
+        names, points drawn, WebGL?, decimation end time). With keep, the
+        figure and its drawn arrays go to that session-state slot so the next
+        poll can extend them (_extend_live) instead of building a new figure.
+        """
+        marks = overlay["items"]
+        TRACE_COLOURS = ["#c9a84c", "#5a9abf", "#7c6a9a", "#4a9a6a", "#bf5a5a", "#9abf5a"]
+
+        # Cut each tag to the visible range and min/max-decimate it to the
+        # chart's pixel budget before anything reaches Plotly, including
+        # full-resolution fetches (Points per tag = 0).
+        visible = []
+        for tag in tags:
+            data = series.get(tag["db_name"].strip())
+            if data is None or tag["display"] in [v[0]["display"] for v in visible]:
+                continue
+            if zoom is not None:
+                data = slice_range(data, *zoom)
+            if not sv_raw:
+                # About 2 points per pixel (each bin keeps its min and max)
+                data = decimate(data, min(int(sv_points) or SENSOR_CHART_PX,
+                                          SENSOR_CHART_PX))
+            if len(data["val"]):
+                visible.append((tag, data))
+        n_drawn = sum(len(d["val"]) * (3 if "min" in d else 1) for _, d in visible)
+        use_gl  = n_drawn > SENSOR_WEBGL_THRESHOLD
+        Trace   = go.Scattergl if use_gl else go.Scatter
+        t_decimated = time.perf_counter()
+
+        fig = go.Figure()
+        display_cols = []
+        traces, arrays = {}, {}
+        for tag, data in visible:
+            col    = tag["display"]
+            colour = TRACE_COLOURS[len(display_cols) % len(TRACE_COLOURS)]
+            scale  = float(tag["scale"])
+            display_cols.append(col)
+
+            # Bucketed reads carry a min / max envelope per point
+            if "min" in data:
+                r, g, b = (int(colour[i:i + 2], 16) for i in (1, 3, 5))
+                fig.add_trace(Trace(
+                    x=data["time"], y=data["min"] * scale,
+                    mode="lines", line=dict(width=0),
+                    legendgroup=col, showlegend=False, hoverinfo="skip",
                 ))
-
-            # Observation overlays
-            if sv_obs:
-                for obs in sv_obs:
-                    fig.add_shape(
-                        type="line",
-                        x0=obs["logged_at"], x1=obs["logged_at"],
-                        y0=0, y1=1,
-                        xref="x", yref="paper",
-                        line=dict(color="#c9a84c", width=1, dash="dot"),
-                    )
-
+                fig.add_trace(Trace(
+                    x=data["time"], y=data["max"] * scale,
+                    mode="lines", line=dict(width=0),
+                    fill="tonexty", fillcolor=f"rgba({r},{g},{b},0.18)",
+                    legendgroup=col, showlegend=False, hoverinfo="skip",
+                ))
+            traces[col] = (tag["db_name"].strip(), len(fig.data), scale)
+            arrays[col] = (data["time"], data["val"])
+            fig.add_trace(Trace(
+                x=data["time"],
+                y=data["val"] * scale,
+                mode="lines",
+                name=col,
+                legendgroup=col,
+                line=dict(color=colour, width=1.5),
+                hovertemplate=f"<b>{col}</b>  %{{y:.3f}}<extra></extra>",
+            ))
+
+        # Observation overlays — individual memos, or one marker per time
+        # bucket (sized by count, coloured by worst severity) when the
+        # visible range holds too many. Lines are one None-separated trace
+        # instead of a layout shape per memo.
+        if marks:
+            if overlay["mode"] == "buckets":
+                half     = overlay["bucket"] / 2
+                mark_x   = [m["bucket"] + half for m in marks]
+                mark_sz  = [min(8 + 3 * np.log2(m["n"]), 24) for m in marks]
+                mark_col = [SEVERITY_COLOUR.get(m["severity"], "#c9a84c") for m in marks]
+                obs_hover = [
+                    (f"<b>{m['n']} memos</b>  ·  worst: {m['severity']}<br>"
+                     f"{m['first_at']:%Y-%m-%d %H:%M} → {m['last_at']:%Y-%m-%d %H:%M}<br>"
+                     f"{(m.get('top_summary') or '').replace(chr(10), ' ')[:200]}")
+                    for m in marks
+                ]
+                mark_title = f"{overlay['bucket']} bucket"
+            else:
+                mark_x   = [o["logged_at"] for o in marks]
+                mark_sz  = 10
+                mark_col = "#c9a84c"
                 obs_hover = [
                     (f"<b>[{o.get('severity', '')}]</b> {o.get('engineer', '')}<br>"
                      f"{(o.get('summary') or o.get('issues_found') or '').replace(chr(10), ' ')[:200]}")
-                    for o in sv_obs
+                    for o in marks
                 ]
-                fig.add_trace(go.Scatter(
-                    x=[o["logged_at"] for o in sv_obs],
-                    y=[0.97] * len(sv_obs),
-                    yaxis="y2",
-                    mode="markers",
-                    name="Observations",
-                    marker=dict(symbol="diamond", size=10, color="#c9a84c",
-                                line=dict(color="#0b0c0e", width=1)),
-                    text=obs_hover,
-                    hovertemplate="<b>Observation</b>  %{x}<br>%{text}<extra></extra>",
-                    hoverlabel=dict(
-                        bgcolor="#111318",
-                        font=dict(family="Share Tech Mono", size=11, color="#c9a84c"),
-                        align="left",
-                    ),
-                ))
-
-            fig.update_layout(
-                plot_bgcolor="#0b0c0e",
-                paper_bgcolor="#0b0c0e",
-                font=dict(family="Share Tech Mono, monospace", color="#c8cdd8", size=11),
-                xaxis=dict(
-                    showgrid=True, gridcolor="#1e2128", gridwidth=1,
-                    tickfont=dict(color="#5a6070", size=10),
-                    title=None,
-                    rangeslider=dict(visible=True, bgcolor="#111318", thickness=0.06),
-                ),
-                yaxis=dict(
-                    showgrid=True, gridcolor="#1e2128", gridwidth=1,
-                    tickfont=dict(color="#c8cdd8", size=10),
-                    title="Value",
-                    titlefont=dict(color="#5a6070"),
-                    zeroline=False,
+                mark_title = "Observation"
+
+            obs_x = []
+            for x in mark_x:
+                obs_x += [x, x, None]
+            fig.add_trace(go.Scatter(
+                x=obs_x,
+                y=[0, 1, None] * len(mark_x),
+                yaxis="y2",
+                mode="lines",
+                line=dict(color="#c9a84c", width=1, dash="dot"),
+                legendgroup="Observations",
+                showlegend=False,
+                hoverinfo="skip",
+            ))
+            fig.add_trace(go.Scatter(
+                x=mark_x,
+                y=[0.97] * len(mark_x),
+                yaxis="y2",
+                mode="markers",
+                name="Observations",
+                legendgroup="Observations",
+                marker=dict(symbol="diamond", size=mark_sz, color=mark_col,
+                            line=dict(color="#0b0c0e", width=1)),
+                text=obs_hover,
+                hovertemplate=f"<b>{mark_title}</b>  %{{x}}<br>%{{text}}<extra></extra>",
+                hoverlabel=dict(
+                    bgcolor="#111318",
+                    font=dict(family="Share Tech Mono", size=11, color="#c9a84c"),
+                    align="left",
                 ),
-                yaxis2=dict(
-                    overlaying="y",
-                    range=[0, 1],
-                    visible=False,
-                    fixedrange=True,
-                ),
-                legend=dict(
-                    bgcolor="#111318", bordercolor="#2a2d35", borderwidth=1,
-                    font=dict(color="#c8cdd8", size=10),
-                ),
-                hovermode="x unified",
-                margin=dict(l=20, r=20, t=20, b=80),
-                height=500,
-                hoverlabel=dict(bgcolor="#111318", font=dict(family="Share Tech Mono")),
-            )
+            ))
 
-            st.plotly_chart(fig, use_container_width=True)
+        fig.update_layout(
+            plot_bgcolor="#0b0c0e",
+            paper_bgcolor="#0b0c0e",
+            font=dict(family="Share Tech Mono, monospace", color="#c8cdd8", size=11),
+            xaxis=dict(
+                showgrid=True, gridcolor="#1e2128", gridwidth=1,
+                tickfont=dict(color="#5a6070", size=10),
+                title=None,
+                rangeslider=dict(visible=True, bgcolor="#111318", thickness=0.06),
+            ),
+            yaxis=dict(
+                showgrid=True, gridcolor="#1e2128", gridwidth=1,
+                tickfont=dict(color="#c8cdd8", size=10),
+                title="Value",
+                titlefont=dict(color="#5a6070"),
+                zeroline=False,
+            ),
+            yaxis2=dict(
+                overlaying="y",
+                range=[0, 1],
+                visible=False,
+                fixedrange=True,
+            ),
+            legend=dict(
+                bgcolor="#111318", bordercolor="#2a2d35", borderwidth=1,
+                font=dict(color="#c8cdd8", size=10),
+            ),
+            hovermode="x unified",
+            margin=dict(l=20, r=20, t=20, b=80),
+            height=500,
+            hoverlabel=dict(bgcolor="#111318", font=dict(family="Share Tech Mono")),
+        )
+        if zoom is not None:
+            fig.update_xaxes(range=list(zoom))
+        if keep:
+            # Envelopes are not extended; bucketed figures are rebuilt each time
+            st.session_state[keep] = (None if any("min" in d for _, d in visible) else
+                                      {"sig": sig, "fig": fig, "use_gl": use_gl,
+                                       "traces": traces, "arrays": arrays})
+        return fig, display_cols, n_drawn, use_gl, t_decimated
+
+    def _live_sig(tags, window):
+        return tuple(t["display"] for t in tags), window
+
+    def _extend_live(live, series):
+        """
+        Extend the kept live figure in place: each trace keeps its drawn points
+        before its last x, then takes everything in series from that x on, so
+        a re-read last bucket replaces the drawn one. Points older than the
+        series' first timestamp are dropped. False (rebuild) when a trace
+        outgrows twice the decimation budget.
+        """
+        budget  = 2 * min(int(sv_points) or SENSOR_CHART_PX, SENSOR_CHART_PX)
+        updates = []
+        for col, (name, idx, scale) in live["traces"].items():
+            data = series.get(name)
+            if data is None or not len(data["val"]):
+                return False
+            x, y = live["arrays"][col]
+            cut  = x[-1] if len(x) else data["time"][0]
+            kept = (x >= data["time"][0]) & (x < cut)
+            add  = data["time"] >= cut
+            x = np.concatenate([x[kept], data["time"][add]])
+            y = np.concatenate([y[kept], data["val"][add]])
+            if not sv_raw and len(x) > 2 * budget:
+                return False
+            updates.append((col, idx, scale, x, y))
+        for col, idx, scale, x, y in updates:
+            live["arrays"][col] = (x, y)
+            live["fig"].data[idx].update(x=x, y=y * scale)
+        return True
+
+
+    def _render_sensor(series, tags, plan, window, zoom=None, zoomable=True, key="sv_chart",
+                       keep=None):
+        """
+        Draw series over the (lo, hi) zoom range, or the whole window when zoom
+        is None. keep names a session-state slot holding the previous figure
+        (live tail); it is extended in place while its tags and window match.
+        """
+        overlay = _load_obs_overlay(*(zoom or window), _version("memo_log"))
+        marks   = overlay["items"]
+        n_obs   = (sum(b["n"] for b in marks) if overlay["mode"] == "buckets" else len(marks))
+        n_points = sum(len(s["val"]) for s in series.values())
+
+        if not n_points:
+            st.info("No sensor data found for the selected tags and time window.", icon="ℹ️")
+        else:
+            t_start = time.perf_counter()
+            live = st.session_state.get(keep) if keep else None
+            if live is not None and live["sig"] == _live_sig(tags, window) \
+                    and _extend_live(live, series):
+                fig, use_gl  = live["fig"], live["use_gl"]
+                display_cols = list(live["traces"])
+                n_drawn      = sum(len(x) for x, _ in live["arrays"].values())
+                t_decimated  = time.perf_counter()
+            else:
+                fig, display_cols, n_drawn, use_gl, t_decimated = _sensor_figure(
+                    series, tags, zoom, overlay, keep, _live_sig(tags, window))
+            t_built = time.perf_counter()
+
+            # Box-select a span to zoom in; the selection is applied once, so
+            # resetting the zoom does not re-apply a stale box.
+            event = st.plotly_chart(fig, use_container_width=True, key=key,
+                                    on_select="rerun" if zoomable else "ignore",
+                                    selection_mode="box")
+            t_sent = time.perf_counter()
+            box = (event.selection.get("box") or []) if zoomable and event else []
+            if box:
+                signature = str(box[0]["x"])
+                if signature != st.session_state.get("sv_zoom_sel"):
+                    x0, x1 = sorted(pd.to_datetime(box[0]["x"], utc=True))
+                    st.session_state.sv_zoom = (x0.to_pydatetime(), x1.to_pydatetime())
+                    st.session_state.sv_zoom_sel = signature
+                    st.rerun()
 
-            st.caption(f"{len(rows):,} data points  ·  {len(display_cols)} tag(s)  ·  {len(sv_obs)} observation(s)")
+            st.caption(f"{n_points:,} data points  ·  {len(display_cols)} tag(s)  ·  "
+                       f"{n_obs:,} observation(s)  ·  Source: {_plan_label(plan)}")
+            st.caption(f"Render: {n_drawn:,} points drawn ({'WebGL' if use_gl else 'SVG'})  ·  "
+                       f"decimate {(t_decimated - t_start) * 1000:.0f} ms  ·  "
+                       f"build {(t_built - t_decimated) * 1000:.0f} ms  ·  "
+                       f"send {(t_sent - t_built) * 1000:.0f} ms")
+            cs = sensor_cache_stats()
+            lookups = cs["hits"] + cs["misses"]
+            st.caption(f"Tile cache: {cs['tiles']:,} tiles  ·  "
+                       f"{cs['bytes'] / 2**20:.1f} / {cs['max_bytes'] / 2**20:.0f} MB  ·  "
+                       f"{(cs['hits'] / lookups if lookups else 0):.0%} hit rate")
 
         # ── Observations table ─────────────────────────────────────────────────
         st.divider()
         st.subheader("OBSERVATIONS LOG")
 
-        if sv_obs:
+        if marks and overlay["mode"] == "buckets":
+            st.caption(f"{n_obs:,} memos in {len(marks)} buckets of {overlay['bucket']}  ·  "
+                       + ("box-select a span on the chart to list individual memos"
+                          if zoomable else "shorten the window to list individual memos"))
+            obs_df = pd.DataFrame([{
+                "Bucket (UTC)":   m["bucket"].strftime("%Y-%m-%d %H:%M"),
+                "Memos":          m["n"],
+                "Worst Severity": m["severity"],
+                "First":          m["first_at"].strftime("%Y-%m-%d %H:%M:%S"),
+                "Last":           m["last_at"].strftime("%Y-%m-%d %H:%M:%S"),
+                "Worst Memo":     m.get("top_summary", ""),
+            } for m in marks])
+            st.dataframe(obs_df, use_container_width=True, hide_index=True)
+        elif marks:
             obs_df = pd.DataFrame([{
                 "Timestamp (UTC)": (o["logged_at"].strftime("%Y-%m-%d %H:%M:%S")
                                     if hasattr(o["logged_at"], "strftime") else str(o["logged_at"])),
@@ -1817,7 +2396,84 @@ elif page == "Sensor View":
                 "Summary":         o.get("summary", ""),
                 "Issues Found":    o.get("issues_found", ""),
                 "Maintenance":     o.get("maintenance_done", ""),
-            } for o in sv_obs])
+            } for o in marks])
             st.dataframe(obs_df, use_container_width=True, hide_index=True)
         else:
             st.info("No observations logged in this time window.", icon="ℹ️")
+
+    # ── Live tail ─────────────────────────────────────────────────────────────
+    # The first run loads the window (plus the longest derived lookback)
+    # through the tile cache; every poll after that re-reads each tag from its
+    # last timestamp on, replaces that point (a rollup's last bucket is still
+    # filling), appends the rest and trims what has scrolled out. The drawn
+    # figure is kept and its traces extended until the overlay minute turns.
+    # Only this fragment reruns.
+    @st.fragment(run_every=timedelta(seconds=int(sv_live_every)))
+    def _sensor_tail(valid_tags, minutes):
+        now       = datetime.now(timezone.utc)
+        keep_from = now - timedelta(minutes=minutes)
+        exprs     = _derived_exprs()
+        db_names  = list(dict.fromkeys([t["db_name"].strip() for t in valid_tags]
+                                       + [tag for _, e in exprs for tag in e.tags]))
+        lookback  = timedelta(seconds=max([e.lookback for _, e in exprs] or [0]))
+        tail      = st.session_state.sv_tail
+
+        try:
+            if (tail is None or tail["names"] != db_names or tail["minutes"] != minutes
+                    or tail["lookback"] != lookback):
+                plan   = plan_sensor_query(keep_from, now, None, len(db_names))
+                series = fetch_sensor_arrays(keep_from - lookback, now, db_names, plan=plan)
+                tail   = {"names": db_names, "minutes": minutes, "lookback": lookback,
+                          "plan": plan, "series": series}
+                st.session_state.sv_live_fig = None
+            else:
+                new = fetch_sensor_tail(tail["series"], keep_from, tail["plan"], lookback)
+                for name, add in new.items():
+                    tail["series"][name] = append_tail(tail["series"][name], add,
+                                                       keep_from - lookback)
+            st.session_state.sv_tail = tail
+        except Exception as e:
+            st.error(f"Live tail error: {e}")
+            return
+
+        # Whole-minute overlay window, so the cached observation query is
+        # reused between polls until a memo is written or the minute turns.
+        minute = now.replace(second=0, microsecond=0)
+        window = (minute - timedelta(minutes=minutes), minute + timedelta(minutes=1))
+        # Derived tags are recomputed from the tailed arrays on every poll
+        derived, pseudo, derive_ms = _derive(tail["series"], exprs, tail["plan"], keep_from, now)
+        st.caption(f"LIVE  ·  last {minutes} min  ·  updated {now.strftime('%H:%M:%S')} UTC"
+                   + (f"  ·  {len(exprs)} derived in {derive_ms:.0f} ms" if exprs else ""))
+        shown = {k: slice_range(v, keep_from) for k, v in tail["series"].items()}
+        _render_sensor({**shown, **derived}, valid_tags + pseudo, tail["plan"], window,
+                       zoomable=False, key="sv_live_chart", keep="sv_live_fig")
+
+    valid_tags = [t for t in st.session_state.sv_tags if t["db_name"].strip()]
+    if sv_live:
+        refs    = [tag for _, e in _derived_exprs() for tag in e.tags]
+        unknown = (unknown_tags([t["db_name"].strip() for t in valid_tags] + refs)
+                   if catalog is not None else {})
+        if not valid_tags and not refs:
+            st.warning("Add at least one tag with a DB Tag Name.")
+        elif unknown:
+            st.error(f"Fix unknown tag(s) before tailing: {', '.join(unknown)}")
+        else:
+            _sensor_tail(valid_tags, int(sv_live_minutes))
+    else:
+        st.session_state.sv_tail = None
+        sv_result = st.session_state.get("sv_result")
+        sv_zoom   = st.session_state.get("sv_zoom")
+        if sv_result is not None:
+            if sv_zoom is not None:
+                zc1, zc2 = st.columns([4, 1])
+                zc1.caption(f"Zoomed to {sv_zoom[0]:%Y-%m-%d %H:%M:%S} → {sv_zoom[1]:%Y-%m-%d %H:%M:%S} UTC"
+                            "  ·  box-select to zoom further")
+                if zc2.button("Reset zoom", key="sv_zoom_reset", use_container_width=True):
+                    st.session_state.sv_zoom = None
+                    st.rerun()
+            n_derived, n_pushed, derive_ms = sv_result.get("derived", (0, 0, 0.0))
+            if n_derived:
+                st.caption(f"Derived: {n_derived} expression(s)  ·  {n_pushed} pushed down to SQL  ·  "
+                           f"{derive_ms:.0f} ms")
+            _render_sensor(sv_result["series"], sv_result["tags"], sv_result["plan"],
+                           sv_result["window"], zoom=sv_zoom)
@@ -0,0 +1,81 @@
+"""
+bench_transcribe.py — compare transcription backends on real recordings.
+
+    python bench_transcribe.py memo.m4a walkthrough.wav
+    python bench_transcribe.py memo.m4a --backends faster-whisper --sizes base small medium
+
+Each (backend, size) pair runs in a fresh process. "peak RSS" is that
+process's high-water mark, which includes the interpreter and the decoded
+clips; "model RSS" is the rise over the high-water mark taken just before
+the model loads, i.e. the cost of the model plus inference. RTF (real-time
+factor) = transcription seconds / audio seconds; below 1.0 is faster than
+real time. The transcript cache is bypassed.
+"""
+
+import argparse
+import multiprocessing as mp
+import resource
+import sys
+import time
+from pathlib import Path
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _run(backend_name, size, compute_type, threads, paths, out):
+    from transcriber import SAMPLE_RATE, decode_audio, make_backend
+
+    clips = [decode_audio(p.read_bytes(), p.suffix) for p in paths]
+    baseline_mb = _peak_rss_mb()
+    t0 = time.perf_counter()
+    backend = make_backend(backend_name, size, compute_type, threads)
+    load_s = time.perf_counter() - t0
+
+    audio_s = work_s = 0.0
+    chars = 0
+    for audio in clips:
+        t0 = time.perf_counter()
+        result = backend.transcribe(audio)
+        work_s  += time.perf_counter() - t0
+        audio_s += len(audio) / SAMPLE_RATE
+        chars   += len(result["text"])
+    rss_mb = _peak_rss_mb()
+    out.put({"load_s": load_s, "audio_s": audio_s, "work_s": work_s, "chars": chars,
+             "rss_mb": rss_mb, "model_mb": rss_mb - baseline_mb})
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("audio", nargs="+", type=Path)
+    ap.add_argument("--backends", nargs="+", default=["openai-whisper", "faster-whisper"])
+    ap.add_argument("--sizes", nargs="+", default=["tiny", "base", "small"])
+    ap.add_argument("--compute-type", default="int8", help="faster-whisper only")
+    ap.add_argument("--threads", type=int, default=0)
+    args = ap.parse_args()
+
+    ctx = mp.get_context("spawn")
+    print(f"{'backend':<16} {'size':<8} {'load s':>7} {'audio s':>8} "
+          f"{'work s':>7} {'RTF':>6} {'peak RSS MB':>12} {'model RSS MB':>13} {'chars':>7}")
+    for name in args.backends:
+        for size in args.sizes:
+            out = ctx.Queue()
+            proc = ctx.Process(target=_run, args=(name, size, args.compute_type,
+                                                  args.threads, args.audio, out))
+            proc.start()
+            proc.join()
+            if proc.exitcode != 0 or out.empty():
+                print(f"{name:<16} {size:<8} failed (exit {proc.exitcode})")
+                continue
+            r = out.get()
+            rtf = r["work_s"] / r["audio_s"] if r["audio_s"] else float("nan")
+            print(f"{name:<16} {size:<8} {r['load_s']:>7.1f} {r['audio_s']:>8.1f} "
+                  f"{r['work_s']:>7.1f} {rtf:>6.2f} {r['rss_mb']:>12.0f} "
+                  f"{r['model_mb']:>13.0f} {r['chars']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""
+sensors.py — NumPy helpers for Sensor View: slicing, decimation and
+derived-tag expressions.
+
+Series here use the per-tag form returned by db_logger.fetch_sensor_arrays():
+{"time": datetime64[us] array, "val": float64 array} plus optional "min" /
+"max" envelope arrays, all the same length and sorted by time.
+"""
+
+import ast
+import functools
+import re
+from datetime import datetime, timezone
+
+import numpy as np
+
+
+# ── Slicing ───────────────────────────────────────────────────────────────────
+
+def to_datetime64(value) -> np.datetime64:
+    """datetime (naive UTC or tz-aware) or datetime64 → datetime64[us] UTC."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "us")
+
+
+def slice_range(entry: dict, lo=None, hi=None) -> dict:
+    """Views of entry restricted to lo <= time < hi (either bound optional)."""
+    t = entry["time"]
+    i = 0 if lo is None else np.searchsorted(t, to_datetime64(lo))
+    j = len(t) if hi is None else np.searchsorted(t, to_datetime64(hi))
+    return {k: v[i:j] for k, v in entry.items()}
+
+
+def append_tail(entry: dict, new: dict, keep_from=None) -> dict:
+    """
+    entry with its points from new's first timestamp on replaced by new (a
+    re-read last rollup bucket supersedes the partial one), cut to
+    keep_from <= time.
+    """
+    if len(new["time"]):
+        i = np.searchsorted(entry["time"], new["time"][0])
+        entry = {k: np.concatenate([v[:i], new[k]]) for k, v in entry.items()}
+    return slice_range(entry, keep_from)
+
+
+# ── Decimation ────────────────────────────────────────────────────────────────
+
+def _first_per_segment(mask: np.ndarray, seg: np.ndarray) -> np.ndarray:
+    """Index of the first True in mask within each segment id of seg."""
+    cand = np.flatnonzero(mask)
+    _, first = np.unique(seg[cand], return_index=True)
+    return cand[first]
+
+
+def decimate(entry: dict, n_bins: int) -> dict:
+    """
+    Min/max decimation to at most 2 * n_bins points.
+
+    The series is cut into n_bins equal time bins. Each bin keeps its minimum
+    and its maximum sample, in time order, so spikes survive however far the
+    series is reduced. Envelope arrays, if present, take the bin's lowest min
+    and highest max. Series already short enough are returned unchanged.
+    """
+    t = entry["time"]
+    n = len(t)
+    if n_bins <= 0 or n <= 2 * n_bins:
+        return entry
+
+    ti = t.astype(np.int64)
+    edges = np.linspace(ti[0], ti[-1], n_bins + 1)
+    bins = np.minimum(np.searchsorted(edges, ti, side="right") - 1, n_bins - 1)
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    seg = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))
+
+    v = entry["val"]
+    lo_src = np.where(np.isnan(v), np.inf, v)
+    hi_src = np.where(np.isnan(v), -np.inf, v)
+    mins = np.minimum.reduceat(lo_src, starts)
+    maxs = np.maximum.reduceat(hi_src, starts)
+    idx = np.union1d(_first_per_segment(lo_src == mins[seg], seg),
+                     _first_per_segment(hi_src == maxs[seg], seg))
+
+    out = {"time": t[idx], "val": v[idx]}
+    if "min" in entry:
+        out["min"] = np.fmin.reduceat(entry["min"], starts)[seg[idx]]
+        out["max"] = np.fmax.reduceat(entry["max"], starts)[seg[idx]]
+    return out
+
+
+# ── Derived tags ──────────────────────────────────────────────────────────────
+# A derived tag is an arithmetic expression over DB tag names, e.g.
+#   M130_RefFreq * 5 / 3
+#   rolling_mean(AO_AOV140, "5min") - AO_AOV140
+#   rate(`TT-101.PV`)
+# Names that are not Python identifiers go in backticks. Expressions are
+# parsed once into a small node tree; evaluation runs whole-array NumPy
+# operations on the referenced tags aligned to a common time grid.
+# Single-tag expressions can instead be rendered as SQL window functions.
+
+_WINDOW_UNITS = {"s": 1, "sec": 1, "m": 60, "min": 60, "h": 3600, "hr": 3600,
+                 "hour": 3600, "d": 86400, "day": 86400}
+# SQL templates are guarded so bad input gives NaN / -inf like NumPy instead
+# of a Postgres error; None means the function never pushes down (exp can
+# overflow, which Postgres raises on).
+_UNARY_FUNCS = {
+    "abs":  (np.abs,  "abs({x})"),
+    "sqrt": (np.sqrt, "(CASE WHEN {x} >= 0 THEN sqrt({x}) ELSE 'NaN'::float8 END)"),
+    "log":  (np.log,  "(CASE WHEN {x} > 0 THEN ln({x}) "
+                      "WHEN {x} = 0 THEN '-Infinity'::float8 ELSE 'NaN'::float8 END)"),
+    "exp":  (np.exp,  None),
+}
+# GREATEST / LEAST treat NaN as larger than everything; NaN operands are
+# nulled first so max() and min() return the other one, like fmax / fmin.
+_BINARY_FUNCS = {"min": (np.fmin, "LEAST"), "max": (np.fmax, "GREATEST")}
+_BINARY_SQL = "COALESCE({f}(NULLIF({a}, 'NaN'), NULLIF({b}, 'NaN')), 'NaN'::float8)"
+
+_SERIES_FUNCS = ("rolling_mean", "rate", "delta")
+
+# Postgres raises "value out of range" when float8 arithmetic on finite
+# operands overflows or underflows to zero, where NumPy gives +-inf / 0.
+# Each operator is rendered as a CASE that detects those results from the
+# operands' magnitudes (clamped so the test itself cannot go out of range)
+# and returns them directly. Zero, inf and NaN operands never raise. A * or /
+# result within an ulp of the float8 maximum may come back as +-inf where
+# NumPy rounds it to +-max.
+_F8_MAX  = "'1.7976931348623157e308'::float8"
+_F8_TINY = "'5e-324'::float8"
+_P100    = "'1.2676506002282294e30'::float8"   # 2 ** 100
+_PM975   = "'3.13151306251402e-294'::float8"   # 2 ** -975; x * y underflows when <= 2 ** -1075
+_INF     = "'Infinity'::float8"
+
+
+def _arith_sql(op, a: str, b: str) -> str:
+    if isinstance(op, (ast.Add, ast.Sub)):
+        # Overflow needs magnitudes that grow: same signs for +, opposite for -
+        sym, up, down = ("+", ">", "<") if isinstance(op, ast.Add) else ("-", "<", ">")
+        return (f"(CASE WHEN abs({a}) <= {_F8_MAX} AND abs({b}) <= {_F8_MAX} "
+                f"AND (({a} > 0 AND {b} {up} 0) OR ({a} < 0 AND {b} {down} 0)) "
+                f"AND GREATEST(abs({a}), 1) * 0.5 + GREATEST(abs({b}), 1) * 0.5 > {_F8_MAX} * 0.5 "
+                f"THEN sign({a}) * {_INF} "
+                f"ELSE {a} {sym} {b} END)")
+    plain = f"{a} * {b}" if isinstance(op, ast.Mult) else f"{a} / NULLIF({b}, 0)"
+    if isinstance(op, ast.Mult):
+        over  = f"abs({b}) > 1 AND abs({a}) >= {_F8_MAX} / GREATEST(abs({b}), 1)"
+        under = (f"LEAST(abs({a}), 1) * {_P100} <= "
+                 f"{_PM975} / LEAST(GREATEST(abs({b}), {_F8_TINY}), 1)")
+    else:
+        over  = f"abs({b}) < 1 AND abs({a}) >= {_F8_MAX} * LEAST(abs({b}), 1)"
+        under = f"LEAST(abs({a}), 1) * {_P100} <= {_PM975} * GREATEST(abs({b}), 1)"
+    return (f"(CASE WHEN NOT (abs({a}) <= {_F8_MAX} AND abs({b}) <= {_F8_MAX} "
+            f"AND {a} <> 0 AND {b} <> 0) THEN {plain} "
+            f"WHEN {over} THEN sign({a}) * sign({b}) * {_INF} "
+            f"WHEN {under} THEN 0::float8 ELSE {plain} END)")
+
+
+class ExpressionError(ValueError):
+    """Raised for derived-tag expressions that cannot be parsed."""
+
+
+class NotPushable(Exception):
+    """The expression has no SQL window-function equivalent."""
+
+
+def _window_seconds(node) -> float:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        seconds = float(node.value)
+    elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+        m = re.fullmatch(r"\s*([0-9.]+)\s*([a-z]+)\s*", node.value.lower())
+        if not m or m.group(2) not in _WINDOW_UNITS:
+            raise ExpressionError(f"Bad window {node.value!r}; use e.g. \"30s\", \"5min\", \"1h\".")
+        seconds = float(m.group(1)) * _WINDOW_UNITS[m.group(2)]
+    else:
+        raise ExpressionError("Window must be a number of seconds or a string like \"5min\".")
+    if seconds <= 0:
+        raise ExpressionError("Window must be positive.")
+    return seconds
+
+
+def _check(node, tags: dict):
+    """Validate the AST and collect tag references; returns max lookback seconds."""
+    if isinstance(node, ast.Expression):
+        return _check(node.body, tags)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return 0.0
+    if isinstance(node, ast.Name):
+        tags.setdefault(node.id, node.id)
+        return 0.0
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)):
+        return max(_check(node.left, tags), _check(node.right, tags))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        return _check(node.operand, tags)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+        name, args = node.func.id, node.args
+        if name in _UNARY_FUNCS and len(args) == 1:
+            return _check(args[0], tags)
+        if name in _BINARY_FUNCS and len(args) == 2:
+            return max(_check(args[0], tags), _check(args[1], tags))
+        if name == "rolling_mean" and len(args) == 2:
+            return _check(args[0], tags) + _window_seconds(args[1])
+        if name in ("rate", "delta") and len(args) == 1:
+            return _check(args[0], tags)
+        raise ExpressionError(f"Unknown function or wrong arguments: {name}()")
+    raise ExpressionError(f"Unsupported syntax: {ast.dump(node)[:60]}")
+
+
+class DerivedExpr:
+    """A parsed derived-tag expression."""
+
+    def __init__(self, text: str):
+        self.text = text
+        # `odd.tag-name` → an identifier placeholder the Python parser accepts
+        quoted = {}
+
+        def _quote(m):
+            key = f"__tag{len(quoted)}"
+            quoted[key] = m.group(1)
+            return key
+
+        source = re.sub(r"`([^`]+)`", _quote, text)
+        try:
+            self._tree = ast.parse(source.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ExpressionError(f"Syntax error: {e.msg}") from None
+        refs = {}
+        self.lookback = _check(self._tree, refs)
+        self._names = {ident: quoted.get(ident, ident) for ident in refs}
+        self.tags = list(dict.fromkeys(self._names.values()))
+
+    # ── NumPy evaluation ──
+
+    def evaluate(self, series: dict) -> dict:
+        """
+        Evaluate over series ({tagname: {"time", "val", ...}}) and return a
+        {"time", "val"} entry on the union of the referenced tags' timestamps.
+        Each tag is carried forward to grid times between its own samples.
+        """
+        if len(self.tags) == 1:
+            grid = series[self.tags[0]]["time"]
+            aligned = {self.tags[0]: series[self.tags[0]]["val"]}
+        else:
+            grid = _merge_times([series[tag]["time"] for tag in self.tags])
+            aligned = {}
+            for tag in self.tags:
+                t, v = series[tag]["time"], series[tag]["val"]
+                idx = np.searchsorted(t, grid, side="right") - 1
+                aligned[tag] = (np.where(idx >= 0, v[np.clip(idx, 0, None)], np.nan)
+                                if len(v) else np.full(len(grid), np.nan))
+        ti = grid.astype(np.int64)
+        with np.errstate(all="ignore"):
+            val = np.broadcast_to(self._eval(self._tree.body, ti, aligned), grid.shape)
+        return {"time": grid, "val": np.asarray(val, dtype=np.float64)}
+
+    def _eval(self, node, ti, aligned):
+        if isinstance(node, ast.Constant):
+            return float(node.value)
+        if isinstance(node, ast.Name):
+            return aligned[self._names[node.id]]
+        if isinstance(node, ast.UnaryOp):
+            x = self._eval(node.operand, ti, aligned)
+            return -x if isinstance(node.op, ast.USub) else x
+        if isinstance(node, ast.BinOp):
+            a = np.asarray(self._eval(node.left, ti, aligned), dtype=np.float64)
+            b = np.asarray(self._eval(node.right, ti, aligned), dtype=np.float64)
+            if isinstance(node.op, ast.Add):
+                return a + b
+            if isinstance(node.op, ast.Sub):
+                return a - b
+            if isinstance(node.op, ast.Mult):
+                return a * b
+            if isinstance(node.op, ast.Pow):
+                return a ** b
+            a, b = np.broadcast_arrays(a, b)
+            return np.divide(a, b, out=np.full(a.shape, np.nan), where=b != 0)
+        name, args = node.func.id, node.args
+        if name in _UNARY_FUNCS:
+            return _UNARY_FUNCS[name][0](self._eval(args[0], ti, aligned))
+        if name in _BINARY_FUNCS:
+            return _BINARY_FUNCS[name][0](self._eval(args[0], ti, aligned),
+                                          self._eval(args[1], ti, aligned))
+        x = np.broadcast_to(np.asarray(self._eval(args[0], ti, aligned), dtype=np.float64), ti.shape)
+        if name == "rolling_mean":
+            return _rolling_mean(ti, x, int(_window_seconds(args[1]) * 1_000_000))
+        step = np.r_[np.nan, np.diff(x)]
+        if name == "delta":
+            return step
+        dt = np.r_[np.nan, np.diff(ti) / 1_000_000]
+        return np.divide(step, dt, out=np.full(step.shape, np.nan), where=dt > 0)
+
+    # ── SQL pushdown ──
+
+    def to_sql(self, value_col: str = "val", time_col: str = "ts") -> str:
+        """
+        SQL for a single-tag expression over value_col / time_col, using
+        window functions for rolling_mean / rate / delta. Raises NotPushable
+        when the expression spans several tags or nests series functions.
+        """
+        if len(self.tags) != 1:
+            raise NotPushable("Only single-tag expressions push down.")
+        return self._sql(self._tree.body, value_col, time_col)
+
+    def _sql(self, node, v, t) -> str:
+        if isinstance(node, ast.Constant):
+            if not np.isfinite(float(node.value)):
+                raise NotPushable("Non-finite constants do not push down.")
+            return repr(float(node.value))
+        if isinstance(node, ast.Name):
+            return v
+        if isinstance(node, ast.UnaryOp):
+            return f"({'-' if isinstance(node.op, ast.USub) else '+'}{self._sql(node.operand, v, t)})"
+        if isinstance(node, ast.BinOp):
+            if isinstance(node.op, ast.Pow):
+                # Postgres raises on negative ** fractional, 0 ** negative and overflow
+                raise NotPushable("** does not push down.")
+            return _arith_sql(node.op, self._sql(node.left, v, t), self._sql(node.right, v, t))
+        name, args = node.func.id, node.args
+        if name in _UNARY_FUNCS:
+            template = _UNARY_FUNCS[name][1]
+            if template is None:
+                raise NotPushable(f"{name}() does not push down.")
+            return template.format(x=self._sql(args[0], v, t))
+        if name in _BINARY_FUNCS:
+            return _BINARY_SQL.format(f=_BINARY_FUNCS[name][1], a=self._sql(args[0], v, t),
+                                      b=self._sql(args[1], v, t))
+        if not isinstance(args[0], ast.Name):
+            raise NotPushable(f"{name}() of an expression does not push down.")
+        if name == "rolling_mean":
+            seconds = _window_seconds(args[1])
+            return (f"avg({v}) OVER (ORDER BY {t} RANGE BETWEEN "
+                    f"interval '{seconds!r} seconds' PRECEDING AND CURRENT ROW)")
+        step = _arith_sql(ast.Sub(), v, f"lag({v}) OVER (ORDER BY {t})")
+        if name == "delta":
+            return step
+        return _arith_sql(ast.Div(), step,
+                          f"extract(epoch FROM {t} - lag({t}) OVER (ORDER BY {t}))::float8")
+
+
+def _merge_times(times: list) -> np.ndarray:
+    """Sorted union of already-sorted timestamp arrays (stable sort merges the runs)."""
+    if not times:
+        return np.array([], dtype="datetime64[us]")
+    grid = np.concatenate(times)
+    grid.sort(kind="stable")
+    return grid[np.r_[True, grid[1:] != grid[:-1]]] if len(grid) else grid
+
+
+def _rolling_mean(ti: np.ndarray, x: np.ndarray, window_us: int) -> np.ndarray:
+    """Mean of the non-NaN samples in [t - window, t] at every t, via cumulative sums."""
+    ok = ~np.isnan(x)
+    csum = np.r_[0.0, np.cumsum(np.where(ok, x, 0.0))]
+    ccount = np.r_[0, np.cumsum(ok)]
+    j = np.searchsorted(ti, ti - window_us, side="left")
+    i = np.arange(1, len(ti) + 1)
+    n = ccount[i] - ccount[j]
+    return np.divide(csum[i] - csum[j], n, out=np.full(len(ti), np.nan), where=n > 0)
+
+
+@functools.lru_cache(maxsize=256)
+def parse_expression(text: str) -> DerivedExpr:
+    """Parse once per distinct expression text (raises ExpressionError)."""
+    return DerivedExpr(text)
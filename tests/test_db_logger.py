@@ -0,0 +1,214 @@
+"""
+Pure helpers in db_logger. Nothing here opens a database connection.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import db_logger
+from config import SENSOR_TILE_POINTS, SENSOR_TILE_SETTLE
+from db_logger import (UNIX_EPOCH, US, _keyset, _tile_span_us, _TileCache,
+                       _to_tsquery_text, fetch_filtered_page, fetch_sensor_arrays)
+
+
+# ── Keyword search ───────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("search, expected", [
+    ("pump valve",                  "pump & valve"),
+    ('"pressure drop"',             "(pressure <-> drop)"),
+    ('"pressure drop" pump',        "(pressure <-> drop) & pump"),
+    ("therm*",                      "therm:*"),
+    ("leak or drip",                "(leak | drip)"),
+    ("leak OR drip or pump",        "(leak | drip | pump)"),
+    ('"open valve" or therm* seal', "((open <-> valve) | therm:*) & seal"),
+    ("pump-7",                      "(pump <-> 7)"),
+], ids=["and", "phrase", "phrase-and", "prefix", "or", "or-chain", "mixed", "hyphen"])
+def test_search_syntax(search, expected):
+    assert _to_tsquery_text(search) == expected
+
+
+@pytest.mark.parametrize("search, expected", [
+    ("or leak",     "or & leak"),      # leading "or" has nothing to join: a plain word
+    ("leak or",     "leak"),           # trailing "or" is dropped
+    ("leak or or drip", "(leak | drip)"),
+    ("& | ! ( ) :* <->", ""),          # tsquery operators alone leave nothing
+    ("pump & !valve", "pump & valve"),
+    ('""', ""),
+    ("", ""),
+    (None, ""),
+], ids=["leading-or", "trailing-or", "double-or", "operators", "inline-operators",
+        "empty-phrase", "empty", "none"])
+def test_stray_operators_never_reach_tsquery(search, expected):
+    assert _to_tsquery_text(search) == expected
+
+
+# ── Records paging ───────────────────────────────────────────────────────────
+
+def test_keyset_cursor_becomes_row_comparison():
+    params = {}
+    clauses, order = _keyset(["severity = %(severity)s"], params, ["logged_at", "id"],
+                             ["logged_at", "id"], None, "next")
+    assert clauses == ["severity = %(severity)s"] and params == {}
+    assert order == "logged_at DESC, id DESC"
+
+    cursor = {"logged_at": datetime(2024, 1, 1, tzinfo=timezone.utc), "id": 7}
+    clauses, order = _keyset([], params, ["logged_at", "id"], ["logged_at", "id"],
+                             cursor, "next")
+    assert clauses == ["(logged_at, id) < (%(k_logged_at)s, %(k_id)s)"]
+    assert params == {"k_logged_at": cursor["logged_at"], "k_id": 7}
+
+    clauses, order = _keyset([], {}, ["rank_expr", "logged_at", "id"],
+                             ["search_rank", "logged_at", "id"],
+                             {"search_rank": 0.5, **cursor}, "prev")
+    assert clauses == ["(rank_expr, logged_at, id) > "
+                       "(%(k_search_rank)s, %(k_logged_at)s, %(k_id)s)"]
+    assert order == "search_rank ASC, logged_at ASC, id ASC"
+
+
+class _FakeMemoLog:
+    """Stands in for _pooled(): applies the keyset clause and LIMIT to rows in memory."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    @contextmanager
+    def __call__(self):
+        yield self
+
+    def cursor(self, cursor_factory=None):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        self.queries.append((sql, dict(params)))
+        backwards = ") > (%(k_" in sql
+        rows = sorted(self.rows, key=lambda r: (r["logged_at"], r["id"]), reverse=not backwards)
+        if "k_id" in params:
+            key = (params["k_logged_at"], params["k_id"])
+            rows = [r for r in rows
+                    if ((r["logged_at"], r["id"]) > key if backwards
+                        else (r["logged_at"], r["id"]) < key)]
+        self._result = rows[:params["limit"]]
+
+    def fetchall(self):
+        return self._result
+
+
+@pytest.fixture
+def memo_log(monkeypatch):
+    t0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    # Ten rows; ids 3-6 share one logged_at, so a page edge falls inside the tie
+    stamps = [0, 1, 2, 5, 5, 5, 5, 8, 9, 10]
+    table = _FakeMemoLog([{"id": i, "logged_at": t0 + timedelta(minutes=m)}
+                          for i, m in enumerate(stamps)])
+    monkeypatch.setattr(db_logger, "_pooled", table)
+    monkeypatch.setattr(db_logger, "psycopg2",
+                        SimpleNamespace(extras=SimpleNamespace(RealDictCursor=None)),
+                        raising=False)
+    return table
+
+
+def test_pages_walk_through_timestamp_ties_without_gaps(memo_log):
+    pages, cursor = [], None
+    while True:
+        page = fetch_filtered_page(page_size=3, cursor=cursor)
+        pages.append(page)
+        if not page["has_next"]:
+            break
+        cursor = page["last"]
+    ids = [r["id"] for p in pages for r in p["rows"]]
+    assert ids == [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]
+    assert [p["has_prev"] for p in pages] == [False, True, True, True]
+    # The cursor is the edge row's full sort key, tie-break id included
+    assert pages[1]["last"] == {"logged_at": pages[1]["rows"][-1]["logged_at"], "id": 4}
+    _, params = memo_log.queries[2]
+    assert params["k_id"] == 4 and params["limit"] == 4
+
+    # Walking back from page 3 returns page 2 in display order
+    back = fetch_filtered_page(page_size=3, cursor=pages[2]["first"], direction="prev")
+    assert back["rows"] == pages[1]["rows"]
+    assert back["has_prev"] and back["has_next"]
+
+
+# ── Sensor tile cache ────────────────────────────────────────────────────────
+
+def _entry(n):
+    return {"time": np.zeros(n, "datetime64[us]"), "val": np.zeros(n)}   # 16 bytes a point
+
+
+def test_tile_cache_evicts_least_recently_used_by_bytes():
+    cache = _TileCache(max_bytes=3 * 160)
+    for k in "abc":
+        cache.put(k, _entry(10))
+    assert cache.get("a") is not None             # a is now the most recent
+    cache.put("d", _entry(10))
+    assert cache.get("b") is None and cache.get("a") is not None
+    assert cache.stats()["bytes"] == 3 * 160
+
+    cache.put("big", _entry(20))                   # needs two slots: evicts c and d
+    assert [k for k in "acd" if cache.get(k) is not None] == ["a"]
+    cache.put("a", _entry(5))                      # replacing a key re-counts its bytes
+    assert cache.stats()["bytes"] == 320 + 80
+    cache.put("huge", _entry(100))                 # larger than the cache: not stored
+    assert cache.get("huge") is None and cache.stats()["tiles"] == 2
+
+
+@pytest.fixture
+def sensor_db(monkeypatch):
+    """Raw source with one point per second; records the [lo, hi) of every read."""
+    reads = []
+
+    def fetch_columns(plan, tag_names, start_time, end_time):
+        lo, hi = ((t - UNIX_EPOCH) // US for t in (start_time, end_time))
+        reads.append((lo, hi))
+        t = np.arange(-(-lo // 1_000_000) * 1_000_000, hi, 1_000_000)
+        return {tag: {"time": t.astype("datetime64[us]"), "val": t / 1e6} for tag in tag_names}
+
+    monkeypatch.setattr(db_logger, "_fetch_columns", fetch_columns)
+    monkeypatch.setattr(db_logger, "resolve_tags", lambda names: {n: 1 for n in names})
+    monkeypatch.setattr(db_logger, "_tile_cache", _TileCache(1 << 24))
+    return reads
+
+
+RAW_PLAN = {"table": "raw", "label": "raw", "resolution": None, "bucket": None}
+
+
+def test_tiles_align_to_the_epoch_and_are_reused(sensor_db):
+    span = _tile_span_us(RAW_PLAN)
+    assert span == SENSOR_TILE_POINTS * 1_000_000
+    start = datetime(2024, 1, 1, 0, 3, 7, tzinfo=timezone.utc)
+    end = start + timedelta(seconds=2.5 * span / 1e6)
+
+    series = fetch_sensor_arrays(start, end, ["T1"], plan=RAW_PLAN)["T1"]
+    assert all(lo % span == 0 and hi % span == 0 for lo, hi in sensor_db)
+    first_us = (start - UNIX_EPOCH) // US
+    np.testing.assert_array_equal(series["time"].astype(np.int64),
+                                  np.arange(first_us, (end - UNIX_EPOCH) // US, 1_000_000))
+
+    # Slide by one tile: only the tile at the new end is read
+    sensor_db.clear()
+    shift = timedelta(microseconds=span)
+    fetch_sensor_arrays(start + shift, end + shift, ["T1"], plan=RAW_PLAN)
+    assert len(sensor_db) == 1 and sensor_db[0][1] - sensor_db[0][0] == span
+
+
+def test_recent_tiles_are_not_cached_until_settled(sensor_db):
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(seconds=2 * SENSOR_TILE_POINTS)
+    fetch_sensor_arrays(start, end, ["T1"], plan=RAW_PLAN)
+    sensor_db.clear()
+    fetch_sensor_arrays(start, end, ["T1"], plan=RAW_PLAN)
+    # Only tiles ending within SENSOR_TILE_SETTLE of now are read again
+    settled_us = (end - UNIX_EPOCH) // US - SENSOR_TILE_SETTLE * 1_000_000
+    assert sensor_db and all(hi > settled_us for _, hi in sensor_db)
+    assert db_logger._tile_cache.stats()["hits"] >= 1
@@ -0,0 +1,68 @@
+"""
+Derived-expression pushdown must give the same values as NumPy evaluation.
+The SQL comparison needs a scratch Postgres: set WEEBO_TEST_DB_URI.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from sensors import NotPushable, append_tail, parse_expression
+
+SAMPLES = np.array([-4.0, -1.0, -0.0, 0.0, 0.25, 1.0, 4.0, np.nan,
+                    1e308, -1e308, 1e-310, np.inf])
+
+PUSHED = ["sqrt(x)", "log(x)", "abs(x) + 1", "x / (x - 1)", "min(x, 0) * 2",
+          "sqrt(log(x))", "log(sqrt(x) - 1)", "max(x, 0)", "max(x, -x) - 1",
+          # overflow to +-inf and underflow to 0 where Postgres would raise
+          "x + x", "x - -x", "x * 10", "x * x", "1 / x", "x / 1e-10", "x * 1e-300",
+          "x / 1e300"]
+NOT_PUSHED = ["exp(x)", "x ** 0.5", "2 ** x", "x * 1e999"]
+
+
+def _numpy(expr: str) -> np.ndarray:
+    t = np.arange(len(SAMPLES)).astype("datetime64[s]").astype("datetime64[us]")
+    return parse_expression(expr).evaluate({"x": {"time": t, "val": SAMPLES}})["val"]
+
+
+@pytest.mark.parametrize("expr", NOT_PUSHED)
+def test_error_prone_sql_is_not_pushed(expr):
+    with pytest.raises(NotPushable):
+        parse_expression(expr).to_sql()
+
+
+@pytest.fixture(scope="module")
+def pg():
+    uri = os.environ.get("WEEBO_TEST_DB_URI")
+    if not uri:
+        pytest.skip("WEEBO_TEST_DB_URI not set")
+    psycopg2 = pytest.importorskip("psycopg2")
+    conn = psycopg2.connect(uri)
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("expr", PUSHED)
+def test_pushdown_matches_numpy_on_negative_and_zero(pg, expr):
+    value_sql = parse_expression(expr).to_sql()
+    with pg.cursor() as cur:
+        cur.execute(f"""
+            SELECT COALESCE(({value_sql})::float8, 'NaN')
+            FROM unnest(%(vals)s::float8[]) WITH ORDINALITY AS s(val, ts)
+            ORDER BY ts
+        """, {"vals": [float(v) for v in SAMPLES]})
+        pushed = np.array([r[0] for r in cur.fetchall()], dtype=np.float64)
+    np.testing.assert_array_equal(pushed, _numpy(expr))
+
+
+def test_tail_replaces_last_bucket_and_trims():
+    t = np.array(["2024-01-01T00:00", "2024-01-01T00:01", "2024-01-01T00:02"], "datetime64[us]")
+    held = {"time": t, "val": np.array([1.0, 2.0, 3.0])}
+    # Re-read from the held last bucket: its value changed, one bucket is new
+    new = {"time": t[2:] + np.array([0, 60_000_000]), "val": np.array([3.5, 4.0])}
+    out = append_tail(held, new, t[1])
+    np.testing.assert_array_equal(out["time"], np.r_[t[1:], t[2] + 60_000_000])
+    np.testing.assert_array_equal(out["val"], [2.0, 3.5, 4.0])
+    empty = {"time": t[:0], "val": np.array([])}
+    np.testing.assert_array_equal(append_tail(held, empty)["val"], held["val"])
@@ -0,0 +1,134 @@
+"""
+Silence trimming and chunking on synthetic audio. Nothing here loads a
+Whisper model.
+"""
+
+import io
+
+import numpy as np
+import pytest
+
+pytest.importorskip("streamlit")
+import transcriber  # noqa: E402
+from transcriber import (SAMPLE_RATE, _stitch, speech_regions,  # noqa: E402
+                         split_at_silence, to_original_time, trim_silence)
+
+SR = SAMPLE_RATE
+
+
+def _noise(seconds, level, seed=0):
+    return (np.random.default_rng(seed).normal(0, level, int(seconds * SR))).astype(np.float32)
+
+
+def _speechlike(seconds, level=0.3, seed=1):
+    """Noise under a 4 Hz syllable envelope: loud, strongly modulated, no pauses."""
+    t = np.arange(int(seconds * SR)) / SR
+    envelope = (0.5 * (1 + np.sin(2 * np.pi * 4 * t))) ** 2
+    return _noise(seconds, level, seed) * envelope.astype(np.float32)
+
+
+# ── VAD ──────────────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("audio", [
+    np.zeros(20 * SR, np.float32),                                         # silence
+    _noise(20, 0.1),                                                       # white noise
+    (0.3 * np.sin(2 * np.pi * 440 * np.arange(20 * SR) / SR)).astype(np.float32),  # tone
+], ids=["silence", "noise", "tone"])
+def test_no_speech_in_unmodulated_audio(audio):
+    assert speech_regions(audio) == []
+    trimmed, time_map = trim_silence(audio)
+    assert len(trimmed) == 0 and time_map is None
+
+
+def test_continuous_speech_is_kept_whole():
+    audio = _speechlike(20)
+    regions = speech_regions(audio)
+    assert regions and sum(hi - lo for lo, hi in regions) > 0.9 * len(audio)
+    trimmed, time_map = trim_silence(audio)
+    assert time_map is None and len(trimmed) == len(audio)
+
+
+def test_bursty_speech_is_trimmed_and_mapped_back():
+    audio = _noise(120, 0.005)
+    bursts = [(10, 14), (60, 70), (100, 101)]
+    for lo, hi in bursts:
+        audio[lo * SR:hi * SR] += _speechlike(hi - lo, seed=lo)
+    regions = speech_regions(audio)
+    assert len(regions) == len(bursts)
+    for (lo, hi), (r_lo, r_hi) in zip(bursts, regions):
+        assert abs(r_lo / SR - lo) < 0.5 and abs(r_hi / SR - hi) < 0.5
+
+    trimmed, time_map = trim_silence(audio)
+    assert len(trimmed) < 0.2 * len(audio)
+    # Start of each kept region on the trimmed timeline maps to its original start
+    np.testing.assert_allclose(to_original_time(time_map["trimmed"], time_map),
+                               time_map["original"])
+    assert to_original_time(time_map["trimmed"][1] + 2.0, time_map) == \
+        pytest.approx(time_map["original"][1] + 2.0)
+
+
+def test_no_speech_returns_cached_empty_transcript(tmp_path, monkeypatch):
+    sf = pytest.importorskip("soundfile")
+
+    class _Backend:
+        name, model_size, options = "fake", "tiny", {}
+        calls = 0
+
+        def transcribe(self, audio):
+            _Backend.calls += 1
+            return {"text": "hallucination", "segments": []}
+
+    monkeypatch.setattr(transcriber, "_get_backend", lambda: _Backend())
+    monkeypatch.setattr(transcriber, "_cache",
+                        transcriber._TranscriptCache(str(tmp_path), 1 << 20))
+    buf = io.BytesIO()
+    sf.write(buf, _noise(5, 0.05), SR, format="WAV")
+
+    first = transcriber.transcribe(buf.getvalue(), ".wav")
+    again = transcriber.transcribe(buf.getvalue(), ".wav")
+    assert first["text"] == "" and first["vad_missed"] and not first["cached"]
+    assert again["cached"] and again["vad_missed"]
+    assert _Backend.calls == 0
+
+
+def test_cache_key_changes_with_every_trim_setting(monkeypatch):
+    base = transcriber._cache.key(b"audio", "m", {"vad": transcriber.vad_settings()})
+    for name in ("VAD_ABS_FLOOR_DB", "VAD_FLOOR_PERCENTILE", "VAD_FLOOR_CEILING_DB",
+                 "VAD_MARGIN_DB", "VAD_PAD_S"):
+        with monkeypatch.context() as m:
+            m.setattr(transcriber, name, getattr(transcriber, name) + 1)
+            assert transcriber._cache.key(
+                b"audio", "m", {"vad": transcriber.vad_settings()}) != base, name
+
+
+# ── Chunking ─────────────────────────────────────────────────────────────────
+
+def test_short_audio_is_one_chunk():
+    audio = _noise(60, 0.1)
+    assert split_at_silence(audio, chunk_s=300) == [(0, len(audio))]
+
+
+def test_chunks_cut_in_nearby_silence_and_tile_the_audio():
+    audio = _noise(1000, 0.3)
+    for s in (290, 615):
+        audio[s * SR:(s + 1) * SR] = 0
+    chunks = split_at_silence(audio, chunk_s=300)
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(audio)
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    cuts = [hi / SR for _, hi in chunks[:-1]]
+    assert 290 <= cuts[0] <= 291 and 615 <= cuts[1] <= 616
+
+
+def test_stitch_keeps_overlap_segments_once_with_shifted_times():
+    spans = [(0.0, 300.0, 0.0), (300.0, float("inf"), 299.0)]
+    results = [
+        {"segments": [{"start": 0.0, "end": 5.0, "text": " first"},
+                      {"start": 298.5, "end": 300.8, "text": " seam"}]},
+        # Second chunk starts 1 s early, so it decodes the seam phrase too
+        {"segments": [{"start": 0.2, "end": 1.6, "text": " seam"},
+                      {"start": 2.0, "end": 4.0, "text": " last"}]},
+    ]
+    out = _stitch(spans, results)
+    assert [s["text"].strip() for s in out["segments"]] == ["first", "seam", "last"]
+    assert out["segments"][-1]["start"] == pytest.approx(301.0)
+    assert out["text"] == "first seam last"
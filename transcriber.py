@@ -1,20 +1,609 @@
 """
 transcriber.py — Whisper transcription for the Streamlit server.
-The model is loaded once and cached; ffmpeg must be installed on the server
+The backend (openai-whisper or faster-whisper) is chosen in config.py and
+its model is loaded once and cached; ffmpeg must be installed on the server
 (handled automatically by packages.txt on Streamlit Community Cloud).
+Audio is decoded in memory to 16 kHz mono float32 rather than through temp
+files. Finished transcripts are cached on disk by audio content, so re-transcribing
+the same memo returns immediately.
 """
 
+import hashlib
+import json
+import os
+import subprocess
 import tempfile
+import threading
 import io
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from math import gcd
+import multiprocessing as mp
 import numpy as np
-import whisper
 import streamlit as st
-from config import WHISPER_MODEL_SIZE
+from config import (WHISPER_MODEL_SIZE, TRANSCRIBE_BACKEND, WHISPER_COMPUTE_TYPE,
+                    WHISPER_CPU_THREADS, TRANSCRIBE_CACHE_DIR, TRANSCRIBE_CACHE_MAX_MB,
+                    TRANSCRIBE_CHUNK_S, TRANSCRIBE_WORKERS, TRANSCRIBE_MAX_WORKERS,
+                    TRANSCRIBE_VAD, VAD_MARGIN_DB, VAD_ABS_FLOOR_DB,
+                    VAD_FLOOR_CEILING_DB)
+
+
+# ── Backends ──────────────────────────────────────────────────────────────────
+# A backend loads one model and turns a 16 kHz mono float32 array into
+# {"text", "segments": [{start, end, text}]}. `options` holds everything that
+# can change the output and goes into the transcript cache key.
+
+class OpenAIWhisperBackend:
+    """Reference PyTorch implementation (openai-whisper), fp32 on CPU."""
+    name = "openai-whisper"
+
+    def __init__(self, model_size: str, compute_type: str = "float32", threads: int = 0):
+        import whisper
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+        self.model_size = model_size
+        self.options    = {"fp16": False}
+        self.model      = whisper.load_model(model_size, device="cpu")
+
+    def transcribe(self, audio: np.ndarray) -> dict:
+        result = self.model.transcribe(audio, **self.options)
+        return {
+            "text":     result["text"].strip(),
+            "segments": [{"start": s["start"], "end": s["end"], "text": s["text"]}
+                         for s in result.get("segments", [])],
+        }
+
+
+class FasterWhisperBackend:
+    """CTranslate2 implementation (faster-whisper); int8 weights by default."""
+    name = "faster-whisper"
+
+    def __init__(self, model_size: str, compute_type: str = "int8", threads: int = 0):
+        from faster_whisper import WhisperModel
+        self.model_size = model_size
+        self.options    = {"compute_type": compute_type, "beam_size": 5}
+        self.model      = WhisperModel(model_size, device="cpu",
+                                       compute_type=compute_type, cpu_threads=threads)
+
+    def transcribe(self, audio: np.ndarray) -> dict:
+        segments, _ = self.model.transcribe(audio, beam_size=self.options["beam_size"])
+        # The generator decodes lazily; materialise it here
+        segments = [{"start": s.start, "end": s.end, "text": s.text} for s in segments]
+        return {
+            "text":     "".join(s["text"] for s in segments).strip(),
+            "segments": segments,
+        }
+
+
+BACKENDS = {b.name: b for b in (OpenAIWhisperBackend, FasterWhisperBackend)}
+
+
+def make_backend(name: str = TRANSCRIBE_BACKEND, model_size: str = WHISPER_MODEL_SIZE,
+                 compute_type: str = WHISPER_COMPUTE_TYPE, threads: int = WHISPER_CPU_THREADS):
+    """Load a backend by name; raises ValueError for unknown names."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown transcription backend {name!r} "
+                         f"(choose from {', '.join(BACKENDS)})")
+    if name == OpenAIWhisperBackend.name:
+        compute_type = "float32"
+    return BACKENDS[name](model_size, compute_type, threads)
 
 
 @st.cache_resource(show_spinner="Loading Whisper model…")
-def _get_model():
-    return whisper.load_model(WHISPER_MODEL_SIZE)
+def _get_backend():
+    return make_backend()
+
+
+# ── Transcript cache ──────────────────────────────────────────────────────────
+# One JSON file per transcript, named by SHA-256 of the audio bytes plus the
+# backend, model size and decode options. A hit touches the file's mtime, so eviction
+# by oldest mtime is LRU across processes sharing the directory.
+
+class _TranscriptCache:
+    def __init__(self, root: str, max_bytes: int):
+        self.root      = root
+        self.max_bytes = max_bytes
+        self.hits      = 0
+        self.misses    = 0
+        self._lock     = threading.Lock()
+
+    @staticmethod
+    def key(audio_bytes: bytes, model: str, options: dict) -> str:
+        h = hashlib.sha256(audio_bytes)
+        h.update(json.dumps({"model": model, "options": options},
+                            sort_keys=True).encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json")
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass    # evicted meanwhile or read-only; the hit still counts
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict):
+        """Store an entry; failures are swallowed, the cache is best-effort."""
+        tmp = None
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            # Written beside the target and renamed, so readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                # default=float covers NumPy scalars in segment timings
+                json.dump(entry, f, default=float)
+            os.replace(tmp, self._path(key))
+            tmp = None
+        except (OSError, TypeError, ValueError):
+            return
+        finally:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+        self._evict()
+
+    def _entries(self) -> list:
+        out = []
+        try:
+            with os.scandir(self.root) as it:
+                for e in it:
+                    if e.name.endswith(".json"):
+                        try:
+                            st_ = e.stat()
+                        except OSError:
+                            continue
+                        out.append((st_.st_mtime, st_.st_size, e.path))
+        except OSError:
+            pass
+        return out
+
+    def _evict(self):
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                total -= size
+
+    def clear(self):
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            "hits":     self.hits,
+            "misses":   self.misses,
+            "entries":  len(entries),
+            "bytes":    sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+_cache = _TranscriptCache(TRANSCRIBE_CACHE_DIR, TRANSCRIBE_CACHE_MAX_MB * 1024 * 1024)
+
+
+def transcript_cache_stats() -> dict:
+    """Hit/miss counts for this process plus the on-disk size of the cache."""
+    return _cache.stats()
+
+
+def clear_transcript_cache():
+    _cache.clear()
+
+
+# ── Decoding ──────────────────────────────────────────────────────────────────
+# Whisper wants 16 kHz mono float32. WAV/FLAC decode natively with soundfile;
+# everything else is piped through ffmpeg (stdin → s16le stdout). Peak memory
+# is the upload plus ~6 bytes per output sample (int16 read buffer + float32
+# result), about 350 MB for an hour of audio.
+
+SAMPLE_RATE     = 16000
+NATIVE_SUFFIXES = {".wav", ".flac"}
+PIPE_CHUNK      = 1 << 20
+
+# Containers whose index may sit at the end of the file (e.g. an .m4a without
+# faststart) can't be demuxed from a pipe; those fall back to a file that is
+# removed as soon as ffmpeg has read it.
+SEEKABLE_SUFFIXES = {".m4a", ".mp4", ".mov", ".aac"}
+
+
+def _to_mono_16k(audio: np.ndarray, sr: int) -> np.ndarray:
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1, dtype=np.float32)
+    if sr != SAMPLE_RATE:
+        from scipy.signal import resample_poly
+        g = gcd(SAMPLE_RATE, sr)
+        audio = resample_poly(audio, SAMPLE_RATE // g, sr // g)
+    return np.ascontiguousarray(audio, dtype=np.float32)
+
+
+def _decode_native(audio_bytes: bytes) -> np.ndarray:
+    import soundfile as sf
+    audio, sr = sf.read(io.BytesIO(audio_bytes), dtype="float32", always_2d=False)
+    return _to_mono_16k(audio, sr)
+
+
+def _ffmpeg_cmd(source: str) -> list[str]:
+    return ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error",
+            "-threads", "0", "-i", source,
+            "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE),
+            "pipe:1"]
+
+
+def _run_ffmpeg(cmd: list[str], feed: bytes = None) -> np.ndarray:
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE if feed is not None else subprocess.DEVNULL,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def _write():
+        # memoryview slices avoid copying the upload while feeding stdin
+        view = memoryview(feed)
+        try:
+            for i in range(0, len(view), PIPE_CHUNK):
+                proc.stdin.write(view[i:i + PIPE_CHUNK])
+        except (BrokenPipeError, OSError):
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+
+    stderr = []
+    err_reader = threading.Thread(target=lambda: stderr.append(proc.stderr.read()), daemon=True)
+    err_reader.start()
+    writer = None
+    if feed is not None:
+        writer = threading.Thread(target=_write, daemon=True)
+        writer.start()
+
+    pcm = bytearray()
+    while True:
+        chunk = proc.stdout.read(PIPE_CHUNK)
+        if not chunk:
+            break
+        pcm += chunk
+    proc.wait()
+    if writer is not None:
+        writer.join()
+    err_reader.join()
+    if proc.returncode != 0:
+        msg = (stderr[0] if stderr else b"").decode(errors="replace").strip()
+        raise RuntimeError(f"ffmpeg could not decode audio: {msg or proc.returncode}")
+
+    audio = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2).astype(np.float32)
+    audio *= 1.0 / 32768.0
+    return audio
+
+
+def decode_audio(audio_bytes: bytes, suffix: str = ".wav") -> np.ndarray:
+    """Decode an upload to a 16 kHz mono float32 array without touching disk
+    (except the fallback for unstreamable MP4-family files)."""
+    suffix = (suffix or "").lower()
+    if suffix in NATIVE_SUFFIXES:
+        try:
+            return _decode_native(audio_bytes)
+        except Exception:
+            pass    # unusual WAV/FLAC encodings go through ffmpeg
+    try:
+        return _run_ffmpeg(_ffmpeg_cmd("pipe:0"), feed=audio_bytes)
+    except RuntimeError:
+        if suffix not in SEEKABLE_SUFFIXES:
+            raise
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, f"audio{suffix}")
+        with open(path, "wb") as f:
+            f.write(audio_bytes)
+        return _run_ffmpeg(_ffmpeg_cmd(path))
+
+
+# ── Silence trimming ──────────────────────────────────────────────────────────
+# Energy VAD on 30 ms frames: a frame is speech when it is VAD_MARGIN_DB above
+# the recording's own noise floor (its 10th-percentile frame level, capped at
+# VAD_FLOOR_CEILING_DB so a clip without pauses doesn't set the floor at its
+# own speech level). A recording whose loudest frame is within the margin of
+# that floor has no speech-like modulation at all — silence, white
+# noise, a steady tone or hum — and yields no regions. Speech runs closer
+# than VAD_MERGE_S are merged, runs shorter than VAD_MIN_SPEECH_S dropped,
+# and the rest padded by VAD_PAD_S and joined with VAD_JOIN_S of silence.
+# The time map lets segment timestamps be moved back onto the original
+# recording.
+
+VAD_FRAME            = SAMPLE_RATE * 30 // 1000
+VAD_FLOOR_PERCENTILE = 10
+VAD_MIN_SPEECH_S     = 0.25
+VAD_MERGE_S          = 1.0     # must exceed 2 × VAD_PAD_S so padded runs don't overlap
+VAD_PAD_S            = 0.3
+VAD_JOIN_S           = 0.3
+VAD_MIN_SAVING       = 0.05    # skip trimming when it would remove less than this
+
+
+def vad_settings() -> dict | None:
+    """Every setting that changes which audio reaches the model (cache key)."""
+    if not TRANSCRIBE_VAD:
+        return None
+    return {"margin_db": VAD_MARGIN_DB, "abs_floor_db": VAD_ABS_FLOOR_DB,
+            "floor_ceiling_db": VAD_FLOOR_CEILING_DB,
+            "floor_percentile": VAD_FLOOR_PERCENTILE, "frame": VAD_FRAME,
+            "min_speech_s": VAD_MIN_SPEECH_S, "merge_s": VAD_MERGE_S,
+            "pad_s": VAD_PAD_S, "join_s": VAD_JOIN_S, "min_saving": VAD_MIN_SAVING}
+
+
+def speech_regions(audio: np.ndarray, margin_db: float = VAD_MARGIN_DB) -> list[tuple]:
+    """(start, end) sample ranges that contain speech."""
+    rms = _frame_rms(audio, VAD_FRAME)
+    if not len(rms):
+        return []
+    db = 20 * np.log10(rms + 1e-10)
+    floor = np.percentile(db, VAD_FLOOR_PERCENTILE)
+    if db.max() - floor < margin_db:
+        return []
+    floor = min(floor, VAD_FLOOR_CEILING_DB)
+    voiced = (db > max(floor + margin_db, VAD_ABS_FLOOR_DB)).astype(np.int8)
+
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced, [0]))))
+    starts, ends = edges[::2], edges[1::2]
+    if not len(starts):
+        return []
+    frame_s = VAD_FRAME / SAMPLE_RATE
+    gap_ok  = (starts[1:] - ends[:-1]) * frame_s >= VAD_MERGE_S
+    starts  = starts[np.concatenate(([True], gap_ok))]
+    ends    = ends[np.concatenate((gap_ok, [True]))]
+    keep    = (ends - starts) * frame_s >= VAD_MIN_SPEECH_S
+    pad     = int(VAD_PAD_S * SAMPLE_RATE)
+    starts  = np.maximum(starts[keep] * VAD_FRAME - pad, 0)
+    ends    = np.minimum(ends[keep] * VAD_FRAME + pad, len(audio))
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def trim_silence(audio: np.ndarray) -> tuple:
+    """
+    (trimmed audio, time map). The map is None when nothing worth removing
+    was found, and trimmed audio is empty when no speech was detected.
+    """
+    regions = speech_regions(audio)
+    if not regions:
+        return audio[:0], None
+    lengths = np.array([hi - lo for lo, hi in regions])
+    if lengths.sum() >= len(audio) * (1 - VAD_MIN_SAVING):
+        return audio, None
+    join = np.zeros(int(VAD_JOIN_S * SAMPLE_RATE), dtype=audio.dtype)
+    parts = []
+    for lo, hi in regions:
+        parts += [audio[lo:hi], join]
+    trimmed = np.concatenate(parts[:-1])
+    trimmed_starts = np.concatenate(([0], np.cumsum(lengths[:-1] + len(join))))
+    time_map = {
+        "trimmed":  trimmed_starts / SAMPLE_RATE,
+        "original": np.array([lo for lo, _ in regions]) / SAMPLE_RATE,
+        "length":   lengths / SAMPLE_RATE,
+    }
+    return trimmed, time_map
+
+
+def to_original_time(t, time_map):
+    """Map seconds on the trimmed timeline back onto the original recording."""
+    if time_map is None:
+        return t
+    t = np.asarray(t, dtype=float)
+    i = np.clip(np.searchsorted(time_map["trimmed"], t, side="right") - 1, 0, None)
+    into = np.clip(t - time_map["trimmed"][i], 0, time_map["length"][i])
+    return time_map["original"][i] + into
+
+
+def _remap_segments(result: dict, time_map) -> dict:
+    if time_map is None or not result["segments"]:
+        return result
+    starts = to_original_time([s["start"] for s in result["segments"]], time_map)
+    ends   = to_original_time([s["end"]   for s in result["segments"]], time_map)
+    segments = [{**s, "start": float(a), "end": float(b)}
+                for s, a, b in zip(result["segments"], starts, ends)]
+    return {**result, "segments": segments}
+
+
+# ── Parallel chunks ───────────────────────────────────────────────────────────
+# Long recordings are cut near every TRANSCRIBE_CHUNK_S seconds at the
+# quietest 100 ms frame within CHUNK_SEARCH_S, and the chunks run in one
+# long-lived spawn process pool, each worker holding its own model and a
+# share of the cores. The pool is sized so the model copies fit in memory.
+# Chunks carry CHUNK_PAD_S of audio past each cut so words at the boundary
+# are decoded with context; a segment is kept only by the chunk whose core
+# contains its midpoint, which removes the duplicates from the overlap.
+
+CHUNK_SEARCH_S = 30
+CHUNK_PAD_S    = 1.0
+CHUNK_FRAME    = SAMPLE_RATE // 10
+
+# Rough resident size of one loaded model in MB (fp32; int8 is ~1/3 of this)
+MODEL_RSS_MB = {"tiny": 400, "base": 600, "small": 1300, "medium": 3000,
+                "large": 6000, "large-v2": 6000, "large-v3": 6000}
+
+
+def _frame_rms(audio: np.ndarray, frame: int) -> np.ndarray:
+    n = len(audio) // frame
+    frames = audio[:n * frame].reshape(n, frame)
+    return np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame)
+
+
+def split_at_silence(audio: np.ndarray, chunk_s: float = TRANSCRIBE_CHUNK_S) -> list[tuple]:
+    """Core (start, end) sample ranges of about chunk_s seconds, cut in silence."""
+    total, step = len(audio), int(chunk_s * SAMPLE_RATE)
+    if total <= step * 3 // 2:
+        return [(0, total)]
+    rms    = _frame_rms(audio, CHUNK_FRAME)
+    search = CHUNK_SEARCH_S * SAMPLE_RATE // CHUNK_FRAME
+    cuts   = [0]
+    while total - cuts[-1] > step * 3 // 2:
+        target = (cuts[-1] + step) // CHUNK_FRAME
+        lo = max(target - search, cuts[-1] // CHUNK_FRAME + 1)
+        hi = min(target + search, len(rms))
+        cuts.append((lo + int(np.argmin(rms[lo:hi]))) * CHUNK_FRAME + CHUNK_FRAME // 2)
+    cuts.append(total)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+def _available_mb():
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def _pool_workers(backend) -> int:
+    """TRANSCRIBE_WORKERS if set, else cores capped by TRANSCRIBE_MAX_WORKERS
+    and by how many model copies fit in half the free memory."""
+    if TRANSCRIBE_WORKERS:
+        return TRANSCRIBE_WORKERS
+    workers = min(os.cpu_count() or 1, TRANSCRIBE_MAX_WORKERS)
+    model_mb = MODEL_RSS_MB.get(backend.model_size, 3000)
+    if backend.options.get("compute_type", "").startswith("int8"):
+        model_mb //= 3
+    free_mb = _available_mb()
+    if free_mb is not None:
+        workers = min(workers, int(free_mb * 0.5 // model_mb))
+    return max(1, workers)
+
+
+_pool = None
+_pool_config = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(backend, workers: int) -> ProcessPoolExecutor:
+    """The shared pool, rebuilt only if the backend or size changed."""
+    global _pool, _pool_config
+    config = (backend.name, backend.model_size, WHISPER_COMPUTE_TYPE, workers)
+    with _pool_lock:
+        if _pool is None or _pool_config != config:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            _pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=mp.get_context("spawn"),
+                                        initializer=_init_worker,
+                                        initargs=(*config[:3], threads))
+            _pool_config = config
+        return _pool
+
+
+def _drop_pool():
+    global _pool, _pool_config
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool, _pool_config = None, None
+
+
+_worker_backend = None
+
+
+def _init_worker(name, model_size, compute_type, threads):
+    global _worker_backend
+    _worker_backend = make_backend(name, model_size, compute_type, threads)
+
+
+def _transcribe_chunk(audio: np.ndarray) -> dict:
+    return _worker_backend.transcribe(audio)
+
+
+def _stitch(spans: list[tuple], results: list[dict]) -> dict:
+    segments = []
+    for (core_lo, core_hi, offset), result in zip(spans, results):
+        for seg in result["segments"]:
+            start, end = seg["start"] + offset, seg["end"] + offset
+            if not core_lo <= (start + end) / 2 < core_hi:
+                continue
+            text = seg["text"].strip()
+            # A phrase straddling the cut can land in both chunks with
+            # slightly different timings; drop the repeat
+            if segments and text == segments[-1]["text"].strip() \
+                    and start < segments[-1]["end"] + CHUNK_PAD_S:
+                continue
+            segments.append({"start": start, "end": end, "text": seg["text"]})
+    return {
+        "text":     " ".join(s["text"].strip() for s in segments if s["text"].strip()),
+        "segments": segments,
+    }
+
+
+def transcribe_audio(backend, audio: np.ndarray) -> dict:
+    """Transcribe decoded audio, in parallel chunks when it is long enough."""
+    cores = split_at_silence(audio)
+    workers = _pool_workers(backend) if len(cores) > 1 else 1
+    if workers == 1:
+        return backend.transcribe(audio)
+
+    pad = int(CHUNK_PAD_S * SAMPLE_RATE)
+    chunks, spans = [], []
+    for lo, hi in cores:
+        start = max(0, lo - pad)
+        chunks.append(audio[start:min(len(audio), hi + pad)])
+        spans.append((lo / SAMPLE_RATE,
+                      hi / SAMPLE_RATE if hi < len(audio) else float("inf"),
+                      start / SAMPLE_RATE))
+    try:
+        results = list(_get_pool(backend, workers).map(_transcribe_chunk, chunks))
+    except BrokenProcessPool:
+        # A worker died (typically out of memory); run this one in-process
+        _drop_pool()
+        return backend.transcribe(audio)
+    return _stitch(spans, results)
+
+
+# ── Transcribe ────────────────────────────────────────────────────────────────
+
+def transcribe(audio_bytes: bytes, suffix: str = ".wav") -> dict:
+    """
+    Transcribe raw audio bytes, returning {"text", "segments": [{start, end,
+    text}], "audio_s", "speech_s", "cached": bool, "vad_missed": bool}.
+    Segment times are on the original recording even when silence was
+    trimmed before decoding. vad_missed means no speech was detected, so the
+    model was not run and the transcript is empty.
+    suffix: file extension hint, e.g. '.m4a', '.wav', '.mp3'
+    """
+    backend = _get_backend()
+    key = _cache.key(audio_bytes, f"{backend.name}/{backend.model_size}",
+                     {**backend.options, "chunk_s": TRANSCRIBE_CHUNK_S,
+                      "vad": vad_settings()})
+    entry = _cache.get(key)
+    if entry is not None:
+        return {**entry, "cached": True}
+
+    audio = decode_audio(audio_bytes, suffix)
+    speech, time_map = trim_silence(audio) if TRANSCRIBE_VAD else (audio, None)
+    # No speech: Whisper would only hallucinate over noise or silence
+    entry = _remap_segments(transcribe_audio(backend, speech), time_map) \
+        if len(speech) else {"text": "", "segments": []}
+    entry["audio_s"]    = len(audio) / SAMPLE_RATE
+    entry["speech_s"]   = len(speech) / SAMPLE_RATE
+    entry["vad_missed"] = len(speech) == 0 and len(audio) > 0
+    _cache.put(key, entry)
+    return {**entry, "cached": False}
 
 
 def transcribe_file(audio_bytes: bytes, suffix: str = ".wav") -> str:
@@ -22,9 +611,4 @@ def transcribe_file(audio_bytes: bytes, suffix: str = ".wav") -> str:
     Transcribe raw audio bytes (from st.file_uploader or st.audio_input).
     suffix: file extension hint, e.g. '.m4a', '.wav', '.mp3'
     """
-    model = _get_model()
-    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-        tmp.write(audio_bytes)
-        tmp_path = tmp.name
-    result = model.transcribe(tmp_path, fp16=False)
-    return result["text"].strip()
+    return transcribe(audio_bytes, suffix)["text"]